@@ -1,9 +1,11 @@
-import json
+import orjson
 import os
+import gzip
 import tempfile
 import boto3
+from botocore.config import Config
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 import numpy as np
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -11,14 +13,62 @@ from aws_lambda_powertools.utilities.data_classes import S3Event
 from birdnet_analyzer.analyze import analyze
 import traceback
 import decimal
+from concurrent.futures import ThreadPoolExecutor
 
 # Initialize AWS Lambda Powertools logger for structured logging
 logger = Logger()
 
-# Initialize AWS service clients for S3 and DynamoDB operations
-s3 = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['DDB_TABLE'])
+# Environment configuration, read once per container
+IS_LOCAL_TEST = os.environ.get("LOCAL_TEST") == "1"
+TABLE_NAME = os.environ['DDB_TABLE']
+# Serialized detection segments above this many bytes go to S3 as gzipped
+# JSON instead of inline, keeping long recordings under DynamoDB's 400 KB
+# item limit
+SEGMENTS_INLINE_LIMIT = int(os.environ.get('SEGMENTS_INLINE_LIMIT', 256 * 1024))
+
+# Initialize AWS service clients for S3 and DynamoDB operations once per
+# container; keep-alive lets warm invocations reuse the pooled connections
+s3 = boto3.client('s3', config=Config(
+    tcp_keepalive=True,
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 3}
+))
+dynamodb = boto3.resource('dynamodb', config=Config(
+    tcp_keepalive=True,
+    max_pool_connections=32
+))
+table = dynamodb.Table(TABLE_NAME)
+
+# Shared worker pool for overlapping the S3 move with the DynamoDB write;
+# kept global so warm invocations reuse the threads
+executor = ThreadPoolExecutor(max_workers=2)
+
+def get_species_key(source_key: str, species_name: str) -> str:
+    """
+    Build the species-specific S3 key an audio file is moved to.
+    
+    Args:
+        source_key (str): Original S3 object key
+        species_name (str): Detected species name for folder organization
+        
+    Returns:
+        str: S3 object key in species-specific directory
+    """
+    return f"species/{species_name}/{os.path.basename(source_key)}"
+
+def get_media_id(bucket: str, s3_key: str) -> str:
+    """
+    Derive the media record ID from the object's final S3 location, so a
+    retried event rewrites the same record instead of adding a duplicate.
+    
+    Args:
+        bucket (str): S3 bucket name
+        s3_key (str): S3 key the file is stored under after processing
+        
+    Returns:
+        str: UUID (version 5) string
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"s3://{bucket}/{s3_key}"))
 
 def move_file_to_species_folder(bucket: str, source_key: str, species_name: str) -> str:
     """
@@ -33,9 +83,8 @@ def move_file_to_species_folder(bucket: str, source_key: str, species_name: str)
     Returns:
         str: New S3 object key in species-specific directory
     """
-    is_local_test = os.environ.get("LOCAL_TEST") == "1" or bucket == "test-bucket"
-    filename = os.path.basename(source_key)
-    new_key = f"species/{species_name}/{filename}"
+    is_local_test = IS_LOCAL_TEST or bucket == "test-bucket"
+    new_key = get_species_key(source_key, species_name)
     if is_local_test:
         logger.info(f"Local test: skip S3 copy_object and delete_object, return {new_key}")
         return new_key
@@ -53,15 +102,50 @@ def move_file_to_species_folder(bucket: str, source_key: str, species_name: str)
     logger.info(f"Deleted original file: {source_key}")
     return new_key
 
+def dumps(obj) -> str:
+    """
+    Serialize a response body with orjson.
+    
+    Args:
+        obj: JSON-compatible object
+        
+    Returns:
+        str: JSON document
+    """
+    return orjson.dumps(obj).decode()
+
 def float_to_decimal(obj):
+    """
+    Convert float values to Decimal type for DynamoDB compatibility.
+    Walks nested lists and dictionaries with an explicit stack instead of
+    recursing per element, copying each container once. Floats go through
+    their shortest repr, so values parsed from BirdNET's text output keep
+    the digits they were written with.
+    
+    Args:
+        obj: Input object (float, list, or dict)
+        
+    Returns:
+        Decimal or original object type
+    """
     if isinstance(obj, float):
-        return decimal.Decimal(str(obj))
-    elif isinstance(obj, list):
-        return [float_to_decimal(i) for i in obj]
-    elif isinstance(obj, dict):
-        return {k: float_to_decimal(v) for k, v in obj.items()}
-    else:
+        return decimal.Decimal(repr(obj))
+    if not isinstance(obj, (list, dict)):
         return obj
+    
+    result = obj.copy()
+    stack = [result]
+    while stack:
+        container = stack.pop()
+        entries = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, value in entries:
+            if isinstance(value, float):
+                container[key] = decimal.Decimal(repr(value))
+            elif isinstance(value, (list, dict)):
+                child = value.copy()
+                container[key] = child
+                stack.append(child)
+    return result
 
 def save_to_dynamodb(
     bucket: str,
@@ -74,10 +158,11 @@ def save_to_dynamodb(
     user_id: str = None
 ) -> str:
     """
-    Save analysis results to DynamoDB
+    Save analysis results to DynamoDB. Segment lists too large to store
+    inline are written to S3 and referenced by detection_segments_s3_key.
     """
-    is_local_test = os.environ.get("LOCAL_TEST") == "1" or os.environ.get("DDB_TABLE") == "your-dynamodb-table-name"
-    media_id = str(uuid.uuid4())
+    is_local_test = IS_LOCAL_TEST or TABLE_NAME == "your-dynamodb-table-name"
+    media_id = get_media_id(bucket, new_key)
     item = {
         'id': media_id,
         'user_id': user_id,
@@ -88,6 +173,29 @@ def save_to_dynamodb(
         'detection_segments': detection_segments,
         'created_at': created_at
     }
+    segments_json = orjson.dumps(detection_segments)
+    if len(segments_json) > SEGMENTS_INLINE_LIMIT:
+        segments_key = f"detections/{media_id}.json.gz"
+        del item['detection_segments']
+        item['detection_segments_s3_key'] = segments_key
+        item['detection_segments_count'] = len(detection_segments)
+        segments_body = gzip.compress(segments_json, compresslevel=6)
+        if is_local_test:
+            # Keep the segments inspectable without touching S3
+            local_path = os.path.join(tempfile.gettempdir(), segments_key)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, 'wb') as f:
+                f.write(segments_body)
+            logger.info(f"Local test: wrote detection segments to {local_path}")
+        else:
+            s3.put_object(
+                Bucket=bucket,
+                Key=segments_key,
+                Body=segments_body,
+                ContentType='application/json',
+                ContentEncoding='gzip'
+            )
+        logger.info(f"Stored {len(detection_segments)} detection segments at: {segments_key}")
     item = float_to_decimal(item)
     if is_local_test:
         logger.info(f"Local test: skip DynamoDB put_item, would save: {item}")
@@ -130,12 +238,13 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
             raise ValueError(f"Unsupported file format: {key}")
         
         # Implement local development mode with direct file access
-        local_file = f"/tmp/{os.path.basename(key)}"
-        is_local_test = os.environ.get("LOCAL_TEST") == "1" or bucket == "test-bucket"
+        filename = os.path.basename(key)
+        local_file = f"/tmp/{filename}"
+        is_local_test = IS_LOCAL_TEST or bucket == "test-bucket"
         if is_local_test:
             import shutil
-            shutil.copyfile(os.path.basename(key), local_file)
-            logger.info(f"Local test: copied {os.path.basename(key)} to {local_file}")
+            shutil.copyfile(filename, local_file)
+            logger.info(f"Local test: copied {filename} to {local_file}")
         else:
             s3.download_file(bucket, key, local_file)
             logger.info(f"Downloaded file to: {local_file}")
@@ -156,7 +265,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
             week=None
         )
         # Parse BirdNET analysis results from tab-separated output file
-        base_name = os.path.splitext(os.path.basename(local_file))[0]
+        base_name = os.path.splitext(filename)[0]
         result_file = os.path.join(output_dir, f"{base_name}.BirdNET.selection.table.txt")
         predictions = []
         if os.path.exists(result_file):
@@ -215,14 +324,17 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         else:
             highest_confidence_species = 'unknown'
         
-        # Organize file in species-specific S3 directory structure
-        new_key = move_file_to_species_folder(bucket, key, highest_confidence_species)
-        logger.info(f"Moved file to species folder: {new_key}")
-        
-        # Persist analysis results to DynamoDB with metadata
-        created_at = datetime.utcnow().isoformat()
+        # Organize file in species-specific S3 directory structure and persist
+        # analysis results to DynamoDB concurrently; the record only needs
+        # the target key
+        new_key = get_species_key(key, highest_confidence_species)
+        created_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
         user_id = event.get('user_id') or None
-        media_id = save_to_dynamodb(
+        move_future = executor.submit(
+            move_file_to_species_folder, bucket, key, highest_confidence_species
+        )
+        save_future = executor.submit(
+            save_to_dynamodb,
             bucket=bucket,
             original_key=key,
             new_key=new_key,
@@ -232,6 +344,9 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
             detected_species=detected_species,
             user_id=user_id
         )
+        move_future.result()
+        logger.info(f"Moved file to species folder: {new_key}")
+        media_id = save_future.result()
         
         # Cleanup temporary processing files
         os.remove(local_file)
@@ -239,7 +354,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': dumps({
                 'message': 'Success',
                 'media_id': media_id,
                 'detected_species': detected_species,
@@ -257,7 +372,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         logger.error(f"Validation error: {str(ve)}")
         return {
             'statusCode': 400,
-            'body': json.dumps({
+            'body': dumps({
                 'message': 'Bad Request',
                 'error': str(ve)
             })
@@ -266,7 +381,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         logger.error(f"Error processing file: {str(e)}\n{traceback.format_exc()}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': dumps({
                 'message': 'Internal Server Error',
                 'error': f"{str(e)}\n{traceback.format_exc()}"
             })
@@ -52,9 +52,6 @@ async function handleFiles(files) {
 }
 
 async function uploadFile(file) {
-    const formData = new FormData();
-    formData.append('file', file);
-    
     try {
         showToast(`Uploading ${file.name}...`, 'info');
         showLoading(true);
@@ -67,12 +64,15 @@ async function uploadFile(file) {
             `Bearer ${token}` : 
             token;
         
-        const response = await fetch(`${config.apiGatewayUrl}/upload`, {
+        // Send the file itself as the request body; the upload handler takes
+        // raw media bodies, so no multipart framing needs to be built or parsed
+        const response = await fetch(`${config.apiGatewayUrl}/upload?filename=${encodeURIComponent(file.name)}`, {
             method: 'POST',
             headers: {
-                'Authorization': authHeader
+                'Authorization': authHeader,
+                'Content-Type': file.type || 'application/octet-stream'
             },
-            body: formData
+            body: file
         });
         
         const data = await response.json();
@@ -3,6 +3,7 @@ import logging
 from typing import Dict, Any, Optional, Union
 import os
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from datetime import datetime
 
@@ -18,7 +19,7 @@ logger.setLevel(logging.INFO)
 API_VERSION = os.environ.get('API_VERSION', 'v1')
 IS_LOCAL = os.environ.get('IS_LOCAL', 'false').lower() == 'true'
 
-cognito = boto3.client('cognito-idp')
+cognito = boto3.client('cognito-idp', config=Config(tcp_keepalive=True))
 
 def get_cors_headers() -> Dict[str, str]:
     """
@@ -88,7 +89,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         Dict[str, Any]: API Gateway response
     """
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
         
         # Handle CORS preflight requests
         if event.get('httpMethod') == 'OPTIONS':
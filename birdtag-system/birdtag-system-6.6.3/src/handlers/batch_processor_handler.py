@@ -1,5 +1,6 @@
 import json
 import logging
+import time
 import uuid
 from typing import Dict, Any, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -31,7 +32,8 @@ def get_cors_headers() -> Dict[str, str]:
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Handle batch processing requests"""
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
         
         # Handle CORS preflight requests
         if event['httpMethod'] == 'OPTIONS':
@@ -106,7 +108,7 @@ def handle_batch_process(event: Dict[str, Any], user_data: Dict[str, Any]) -> Di
             'processedFiles': 0,
             'failedFiles': 0,
             'results': [],
-            'createdAt': datetime.utcnow().isoformat()
+            'createdAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
         }
         
         create_batch_job(job_data)
@@ -2,7 +2,7 @@ import json
 import logging
 import os
 import boto3
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
 from PIL import Image
 import io
@@ -10,14 +10,17 @@ import uuid
 from datetime import datetime
 import tempfile
 import time
-import supervision as sv
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from ultralytics import YOLO
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import cv2
 
 from ..utils.s3_utils import (
     download_file,
-    upload_file,
+    read_object,
+    upload_file_to_s3,
     get_presigned_url,
     get_content_type
 )
@@ -32,7 +35,6 @@ from ..utils.image_utils import (
     is_valid_image,
     resize_image,
     get_image_dimensions,
-    load_image,
     convert_to_jpg,
     normalize_image
 )
@@ -55,11 +57,29 @@ DYNAMODB_TABLE = os.environ.get('DYNAMODB_TABLE')
 CACHE_TTL = int(os.environ.get('CACHE_TTL', 3600))
 MAX_RETRIES = int(os.environ.get('MAX_RETRIES', 3))
 CONFIDENCE_THRESHOLD = float(os.environ.get('CONFIDENCE_THRESHOLD', 0.5))
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 128))
 
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=Config(tcp_keepalive=True))
 table = dynamodb.Table(DYNAMODB_TABLE)
 
+# Worker threads for S3/DynamoDB round-trips that do not depend on each other
+executor = ThreadPoolExecutor(max_workers=4)
+
+# YOLO model and its class names as an array indexable by class ID,
+# loaded on first use and reused across warm invocations
+MODEL_PATH = os.path.join(tempfile.gettempdir(), MODEL_KEY)
+_model = None
+_class_names = None
+
+# Annotation colour (BGR), label font and JPEG encoding parameters
+BOX_COLOR = (0, 255, 0)
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+ANNOTATED_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 85]
+
+# Serialized response bodies, reused across warm invocations
+_response_bodies: "OrderedDict[Tuple[str, str, Any], str]" = OrderedDict()
+
 def get_cors_headers() -> Dict[str, str]:
     """Return CORS headers for HTTP responses."""
     return {
@@ -89,66 +109,123 @@ def check_cache(file_key: str) -> Optional[Dict[str, Any]]:
         logger.warning(f"Cache check failed: {str(e)}")
     return None
 
-def process_image(
-    image_path: str,
-    model_path: str,
+def get_response_body(bucket: str, key: str, results: Dict[str, Any]) -> str:
+    """
+    Return the JSON body for detection results, serializing each result once.
+    
+    Bodies are pooled by (bucket, key, timestamp) so repeated requests for the
+    same detection return the same string; a refreshed detection carries a new
+    timestamp and therefore never matches a stale body.
+    
+    Args:
+        bucket (str): S3 bucket of the image file
+        key (str): The S3 key of the image file
+        results (Dict[str, Any]): Detection results to serialize
+        
+    Returns:
+        str: JSON encoded response body
+    """
+    cache_key = (bucket, key, results.get('timestamp', 0))
+    body = _response_bodies.get(cache_key)
+    if body is not None:
+        _response_bodies.move_to_end(cache_key)
+        return body
+    
+    body = json.dumps(results, default=float)
+    _response_bodies[cache_key] = body
+    if len(_response_bodies) > RESPONSE_CACHE_SIZE:
+        _response_bodies.popitem(last=False)
+    return body
+
+def get_model() -> YOLO:
+    """
+    Return the YOLO model, downloading and loading it on first use. MODEL_KEY
+    may name an ONNX export instead of the .pt weights, in which case
+    inference runs on ONNX Runtime's CPU kernels.
+    
+    Returns:
+        YOLO: Model instance shared by every invocation of this container
+    """
+    global _model, _class_names
+    if _model is None:
+        if not os.path.exists(MODEL_PATH):
+            download_file(MODEL_BUCKET, MODEL_KEY, MODEL_PATH)
+        try:
+            model = YOLO(MODEL_PATH, task='detect')
+        except Exception:
+            # Drop a corrupt download so the next attempt fetches it again
+            os.unlink(MODEL_PATH)
+            raise
+        _class_names = np.array([model.names[i] for i in range(len(model.names))])
+        _model = model
+    return _model
+
+def annotate_result(img: np.ndarray, result: Any, confidence: float) -> List[Dict[str, Any]]:
+    """
+    Filter one image's detections by confidence and draw them onto the image.
+    
+    Args:
+        img (np.ndarray): Decoded image, annotated in place
+        result (Results): Ultralytics result for img
+        confidence (float): Confidence threshold for detections
+        
+    Returns:
+        list: Detection results kept for img
+    """
+    boxes = result.boxes
+    confidences = boxes.conf.cpu().numpy()
+    keep = confidences > confidence
+    xyxy = boxes.xyxy.cpu().numpy()[keep].astype(np.int32).tolist()
+    species = _class_names[boxes.cls.cpu().numpy()[keep].astype(np.int32)].tolist()
+    
+    # Extract detection results and draw each box and its label in one
+    # pass straight onto the decoded image, which is not needed
+    # unannotated afterwards
+    detection_results = []
+    for (x1, y1, x2, y2), name, conf in zip(xyxy, species, confidences[keep].tolist()):
+        detection_results.append({'species': name, 'confidence': conf})
+        label = f"{name} {conf*100:.2f}%"
+        cv2.rectangle(img, (x1, y1), (x2, y2), BOX_COLOR, 2)
+        cv2.putText(img, label, (x1, max(y1 - 5, 12)), LABEL_FONT, 0.5, BOX_COLOR, 1, cv2.LINE_AA)
+    return detection_results
+
+def process_images(
+    images: List[Optional[np.ndarray]],
     confidence: float = CONFIDENCE_THRESHOLD,
     max_retries: int = MAX_RETRIES
-) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+) -> List[Tuple[List[Dict[str, Any]], np.ndarray]]:
     """
-    Process a single image and return detection results with retry mechanism.
+    Process several images in one batched forward pass with retry mechanism.
     
     Args:
-        image_path (str): Path to the image file
-        model_path (str): Path to the YOLO model
+        images (List[np.ndarray]): Decoded images, None where decoding failed
         confidence (float): Confidence threshold for detections
         max_retries (int): Maximum number of retry attempts
         
     Returns:
-        tuple: (list of detection results, annotated image)
+        list: (list of detection results, annotated image) for each image
     """
     retry_count = 0
     last_error = None
     
     while retry_count < max_retries:
         try:
-            # Load YOLO model
-            model = YOLO(model_path)
+            # Load YOLO model (cached after the first invocation)
+            model = get_model()
             
-            # Read image
-            img = load_image(image_path)
-            if img is None:
+            if any(img is None for img in images):
                 raise BirdTagError(
                     message="Failed to read image",
                     error_code=ErrorCode.PROCESSING_FAILED,
                     status_code=400
                 )
             
-            # Run detection
-            result = model(img)[0]
-            detections = sv.Detections.from_ultralytics(result)
-            
-            # Extract detection results
-            detection_results = []
-            if detections.class_id is not None:
-                detections = detections[(detections.confidence > confidence)]
-                for cls_id, conf in zip(detections.class_id, detections.confidence):
-                    detection_results.append({
-                        'species': model.names[cls_id],
-                        'confidence': float(conf)
-                    })
-            
-            # Create annotated image
-            annotated_img = img.copy()
-            if len(detection_results) > 0:
-                box_annotator = sv.BoxAnnotator()
-                label_annotator = sv.LabelAnnotator()
-                
-                box_annotator.annotate(annotated_img, detections=detections)
-                labels = [f"{r['species']} {r['confidence']*100:.2f}%" for r in detection_results]
-                label_annotator.annotate(annotated_img, detections=detections, labels=labels)
-            
-            return detection_results, annotated_img
+            # Run detection over the whole batch at once
+            results = model(images)
+            return [
+                (annotate_result(img, result, confidence), img)
+                for img, result in zip(images, results)
+            ]
             
         except Exception as e:
             last_error = e
@@ -165,6 +242,90 @@ def process_image(
                     details={"original_error": str(last_error)}
                 )
 
+def process_image(
+    image: Optional[np.ndarray],
+    confidence: float = CONFIDENCE_THRESHOLD,
+    max_retries: int = MAX_RETRIES
+) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """
+    Process a single image and return detection results with retry mechanism.
+    
+    Args:
+        image (np.ndarray): Decoded image, None if decoding failed
+        confidence (float): Confidence threshold for detections
+        max_retries (int): Maximum number of retry attempts
+        
+    Returns:
+        tuple: (list of detection results, annotated image)
+    """
+    return process_images([image], confidence, max_retries)[0]
+
+def detect_targets(targets: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Return detection results for each (bucket, key). Cached results are
+    reused; every other image is read into memory concurrently and run
+    through the model in a single batch.
+    
+    Args:
+        targets (List[Tuple[str, str]]): S3 bucket and key of each image
+        
+    Returns:
+        list: Detection results for each target, in order
+    """
+    results = [check_cache(key) for _, key in targets]
+    pending = [i for i, cached in enumerate(results) if not cached]
+    if not pending:
+        return results
+    
+    # Load the model (a download on cold start) while the images download;
+    # a failed load is retried by process_images
+    model_future = executor.submit(get_model)
+    
+    # Decode straight from the response bodies, without a copy in /tmp
+    images = list(executor.map(
+        lambda i: cv2.imdecode(np.frombuffer(read_object(*targets[i]), np.uint8), cv2.IMREAD_COLOR),
+        pending
+    ))
+    wait([model_future])
+    
+    # Process images
+    processed = process_images(
+        images=images,
+        confidence=CONFIDENCE_THRESHOLD,
+        max_retries=MAX_RETRIES
+    )
+    
+    # Save annotated images and update the cache concurrently
+    futures = []
+    timestamp = int(time.time())
+    for i, (detection_results, annotated_img) in zip(pending, processed):
+        bucket, key = targets[i]
+        annotated_key = f"annotated/{key}"
+        _, annotated_buf = cv2.imencode('.jpg', annotated_img, ANNOTATED_JPEG_PARAMS)
+        futures.append(executor.submit(
+            upload_file_to_s3,
+            bucket,
+            annotated_key,
+            annotated_buf.tobytes(),
+            'image/jpeg'
+        ))
+        
+        # Prepare response
+        results[i] = {
+            'detections': detection_results,
+            'annotatedImageUrl': f"s3://{bucket}/{annotated_key}",
+            'timestamp': timestamp
+        }
+        futures.append(executor.submit(
+            update_media_record,
+            DYNAMODB_TABLE,
+            key,
+            {'detectionResults': results[i]}
+        ))
+    for future in futures:
+        future.result()
+    return results
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda function handler for processing image files.
@@ -177,7 +338,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         dict: Response with processing results
     """
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
         
         # Handle CORS preflight requests
         if event.get('httpMethod') == 'OPTIONS':
@@ -195,71 +357,29 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 status_code=500
             )
         
-        # Get bucket and key from event
+        # Get bucket and key from event; an S3 event may carry several records
         if 'Records' in event and event['Records'][0]['eventSource'] == 'aws:s3':
-            bucket = event['Records'][0]['s3']['bucket']['name']
-            key = event['Records'][0]['s3']['object']['key']
+            targets = [
+                (record['s3']['bucket']['name'], record['s3']['object']['key'])
+                for record in event['Records']
+            ]
         else:
             # Handle API Gateway request
             body = json.loads(event.get('body', '{}'))
             validate_required_fields(body, ['bucket', 'key'])
-            bucket = body['bucket']
-            key = body['key']
-        
-        # Check cache first
-        cached_results = check_cache(key)
-        if cached_results:
-            return {
-                'statusCode': 200,
-                'headers': get_cors_headers(),
-                'body': json.dumps(cached_results)
-            }
-        
-        # Download model file
-        model_path = os.path.join(tempfile.gettempdir(), MODEL_KEY)
-        download_file(MODEL_BUCKET, MODEL_KEY, model_path)
-        
-        # Download image file
-        image_path = os.path.join(tempfile.gettempdir(), os.path.basename(key))
-        download_file(bucket, key, image_path)
-        
-        # Process image
-        detection_results, annotated_img = process_image(
-            image_path=image_path,
-            model_path=model_path,
-            confidence=CONFIDENCE_THRESHOLD,
-            max_retries=MAX_RETRIES
-        )
-        
-        # Save annotated image
-        annotated_key = f"annotated/{key}"
-        annotated_path = os.path.join(tempfile.gettempdir(), "annotated.jpg")
-        cv2.imwrite(annotated_path, annotated_img)
-        upload_file(annotated_path, bucket, annotated_key)
-        
-        # Prepare response
-        response_data = {
-            'detections': detection_results,
-            'annotatedImageUrl': f"s3://{bucket}/{annotated_key}",
-            'timestamp': int(time.time())
-        }
-        
-        # Update cache
-        update_media_record(
-            DYNAMODB_TABLE,
-            key,
-            {'detectionResults': response_data}
-        )
+            targets = [(body['bucket'], body['key'])]
         
-        # Cleanup
-        os.unlink(model_path)
-        os.unlink(image_path)
-        os.unlink(annotated_path)
+        # Cached results are returned as-is, the rest are detected in one batch
+        results = detect_targets(targets)
+        bodies = [
+            get_response_body(bucket, key, response_data)
+            for (bucket, key), response_data in zip(targets, results)
+        ]
         
         return {
             'statusCode': 200,
             'headers': get_cors_headers(),
-            'body': json.dumps(response_data)
+            'body': bodies[0] if len(bodies) == 1 else f"[{','.join(bodies)}]"
         }
         
     except BirdTagError as e:
@@ -4,9 +4,11 @@ import tempfile
 import time
 import logging
 import boto3
-from typing import Dict, Any, List, Optional
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from birdnet_analyzer import analyze_audio
+import tflite_runtime.interpreter as tflite
 
 from utils.s3_utils import (
     download_file,
@@ -42,10 +44,25 @@ DYNAMODB_TABLE = os.environ.get('DYNAMODB_TABLE')
 CACHE_TTL = int(os.environ.get('CACHE_TTL', 3600))
 MAX_RETRIES = int(os.environ.get('MAX_RETRIES', 3))
 
+# BirdNET scores 3-second windows of 48 kHz mono audio
+SAMPLE_RATE = 48000
+CHUNK_SAMPLES = 3 * SAMPLE_RATE
+# Windows scored per invoke; the input tensor is allocated once at this
+# size, which bounds peak memory regardless of clip length
+BATCH_WINDOWS = 32
+
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=Config(tcp_keepalive=True))
 table = dynamodb.Table(DYNAMODB_TABLE)
 
+# BirdNET interpreter and labels, loaded on first use and reused across
+# warm invocations
+MODEL_DIR = os.path.join(tempfile.gettempdir(), 'birdnet_model')
+MODEL_PATH = os.path.join(MODEL_DIR, 'model.tflite')
+LABELS_PATH = os.path.join(MODEL_DIR, 'labels.txt')
+_interpreter = None
+_labels = None
+
 def get_cors_headers() -> Dict[str, str]:
     """Return CORS headers for HTTP responses."""
     return {
@@ -75,9 +92,33 @@ def check_cache(file_key: str) -> Optional[Dict[str, Any]]:
         logger.warning(f"Cache check failed: {str(e)}")
     return None
 
+def get_interpreter() -> Tuple[tflite.Interpreter, List[str]]:
+    """
+    Return the BirdNET interpreter and its labels, downloading the model
+    files and allocating tensors for BATCH_WINDOWS windows on first use.
+    
+    Returns:
+        tuple: (Interpreter with allocated tensors, list of species labels)
+    """
+    global _interpreter, _labels
+    if _interpreter is None:
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        if not os.path.exists(MODEL_PATH):
+            download_file(MODEL_BUCKET, 'birdnet/model.tflite', MODEL_PATH)
+        if not os.path.exists(LABELS_PATH):
+            download_file(MODEL_BUCKET, 'birdnet/labels.txt', LABELS_PATH)
+        
+        with open(LABELS_PATH) as f:
+            _labels = [line.strip() for line in f]
+        interpreter = tflite.Interpreter(model_path=MODEL_PATH, num_threads=os.cpu_count())
+        input_index = interpreter.get_input_details()[0]['index']
+        interpreter.resize_tensor_input(input_index, (BATCH_WINDOWS, CHUNK_SAMPLES))
+        interpreter.allocate_tensors()
+        _interpreter = interpreter
+    return _interpreter, _labels
+
 def process_audio(
     audio_path: str,
-    model_path: str,
     confidence: float = 0.5,
     max_retries: int = MAX_RETRIES
 ) -> Dict[str, Any]:
@@ -86,7 +127,6 @@ def process_audio(
     
     Args:
         audio_path (str): Path to the audio file
-        model_path (str): Path to the BirdNET model
         confidence (float): Confidence threshold for detections
         max_retries (int): Maximum number of retry attempts
         
@@ -104,14 +144,46 @@ def process_audio(
                 convert_to_wav(audio_path, wav_path)
                 audio_path = wav_path
             
-            # Load and analyze audio
-            results = analyze_audio(audio_path, model_path, confidence)
+            interpreter, labels = get_interpreter()
+            input_index = interpreter.get_input_details()[0]['index']
+            output_index = interpreter.get_output_details()[0]['index']
             
-            # Add audio duration
-            duration = get_audio_duration(audio_path)
-            results['duration'] = duration
+            # Load audio and split it into zero-padded windows, one per row
+            audio_data, sr = load_audio_file(audio_path, SAMPLE_RATE)
+            num_chunks = -(-len(audio_data) // CHUNK_SAMPLES)
+            chunks = np.zeros(num_chunks * CHUNK_SAMPLES, dtype=np.float32)
+            chunks[:len(audio_data)] = audio_data
+            chunks = chunks.reshape(num_chunks, CHUNK_SAMPLES)
             
-            return results
+            # Score the windows BATCH_WINDOWS at a time, zero-padding the
+            # last batch to the allocated input shape
+            batch = np.zeros((BATCH_WINDOWS, CHUNK_SAMPLES), dtype=np.float32)
+            logits = []
+            for start in range(0, num_chunks, BATCH_WINDOWS):
+                windows = chunks[start:start + BATCH_WINDOWS]
+                batch[:len(windows)] = windows
+                batch[len(windows):] = 0
+                interpreter.set_tensor(input_index, batch)
+                interpreter.invoke()
+                logits.append(interpreter.get_tensor(output_index)[:len(windows)])
+            scores = 1 / (1 + np.exp(-np.concatenate(logits)))
+            
+            duration = len(audio_data) / sr
+            chunk_seconds = CHUNK_SAMPLES / sr
+            detections = [
+                {
+                    'species': labels[label_index],
+                    'confidence': float(scores[chunk_index, label_index]),
+                    'start_time': chunk_index * chunk_seconds,
+                    'end_time': min((chunk_index + 1) * chunk_seconds, duration)
+                }
+                for chunk_index, label_index in np.argwhere(scores >= confidence)
+            ]
+            
+            return {
+                'results': detections,
+                'duration': duration
+            }
             
         except Exception as e:
             last_error = e
@@ -140,7 +212,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         dict: Response with analysis results
     """
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
         
         # Handle CORS preflight requests
         if event.get('httpMethod') == 'OPTIONS':
@@ -182,31 +255,19 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 })
             }
         
-        # Download model files if not present
-        model_dir = '/tmp/birdnet_model'
-        os.makedirs(model_dir, exist_ok=True)
-        
-        model_path = os.path.join(model_dir, 'model.tflite')
-        labels_path = os.path.join(model_dir, 'labels.txt')
-        
-        if not os.path.exists(model_path):
-            download_file(MODEL_BUCKET, 'birdnet/model.tflite', model_path)
-        if not os.path.exists(labels_path):
-            download_file(MODEL_BUCKET, 'birdnet/labels.txt', labels_path)
-        
         # Download audio to temp file
         with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
             download_file(bucket, key, tmp_file.name)
             
             # Process audio
-            results = process_audio(tmp_file.name, model_path)
+            results = process_audio(tmp_file.name)
             
-            # Extract detected species
-            detected_species = []
-            if 'results' in results:
-                for detection in results['results']:
-                    if detection['confidence'] >= 0.5:  # Filter by confidence
-                        detected_species.append(detection['species'])
+            # Extract detected species, once each however many windows matched
+            detected_species = list({
+                detection['species']
+                for detection in results.get('results', [])
+                if detection['confidence'] >= 0.5  # Filter by confidence
+            })
             
             # Save results to DynamoDB
             create_media_record(
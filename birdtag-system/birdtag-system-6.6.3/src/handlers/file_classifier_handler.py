@@ -3,6 +3,7 @@ import os
 import logging
 import boto3
 from typing import Dict, Any, Optional
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from utils.error_utils import BirdTagError, ErrorCode, create_error_response as create_error
@@ -13,7 +14,7 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-s3_client = boto3.client('s3')
+s3_client = boto3.client('s3', config=Config(tcp_keepalive=True))
 
 # Environment variables
 MEDIA_BUCKET = os.environ.get('MEDIA_BUCKET')
@@ -112,7 +113,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         dict: Response with processing results
     """
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
         
         # Handle CORS preflight requests
         if event.get('httpMethod') == 'OPTIONS':
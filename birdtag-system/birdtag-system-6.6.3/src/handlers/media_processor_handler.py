@@ -5,8 +5,10 @@ import boto3
 import tempfile
 import subprocess
 from typing import Dict, Any, Optional
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from utils.s3_utils import generate_download_url
 from utils.error_utils import BirdTagError, ErrorCode, create_error_response as create_error
 from utils.error_utils import validate_required_fields
 
@@ -15,7 +17,7 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-s3_client = boto3.client('s3')
+s3_client = boto3.client('s3', config=Config(tcp_keepalive=True))
 
 # Environment variables
 MEDIA_BUCKET = os.environ.get('MEDIA_BUCKET')
@@ -45,11 +47,13 @@ def process_video(video_path: str, output_path: str, timestamp: int = 5) -> None
         BirdTagError: If frame extraction fails
     """
     try:
-        # Use FFmpeg to extract frame at specified timestamp
+        # Use FFmpeg to extract frame at specified timestamp; seeking before
+        # -i jumps to the nearest keyframe instead of decoding every frame
+        # up to the timestamp
         cmd = [
             FFMPEG_PATH,
-            '-i', video_path,
             '-ss', str(timestamp),
+            '-i', video_path,
             '-vframes', '1',
             '-q:v', '2',
             output_path
@@ -112,6 +116,17 @@ def process_audio(audio_path: str, output_path: str) -> None:
             details={"original_error": str(e)}
         )
 
+# Per supported extension: (generator, output suffix, S3 prefix, response
+# field name, success message)
+VIDEO_PROCESSOR = (process_video, '_preview.jpg', VIDEO_PREVIEW_PREFIX, 'preview',
+                   'Video preview generated successfully')
+AUDIO_PROCESSOR = (process_audio, '_waveform.jpg', AUDIO_WAVEFORM_PREFIX, 'waveform',
+                   'Audio waveform generated successfully')
+MEDIA_PROCESSORS = {
+    **dict.fromkeys(('.mp4', '.avi', '.mov'), VIDEO_PROCESSOR),
+    **dict.fromkeys(('.wav', '.mp3', '.m4a'), AUDIO_PROCESSOR)
+}
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Handle media processing requests.
@@ -124,7 +139,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         dict: Response with processing results
     """
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
         
         # Handle CORS preflight requests
         if event.get('httpMethod') == 'OPTIONS':
@@ -153,72 +169,41 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             bucket = body['bucket']
             key = body['key']
         
-        # Determine media type and processing method
-        file_extension = os.path.splitext(key)[1].lower()
+        # Determine media type and processing method before downloading
+        base_name, file_extension = os.path.splitext(os.path.basename(key))
+        processor = MEDIA_PROCESSORS.get(file_extension.lower())
+        if processor is None:
+            raise BirdTagError(
+                message="Unsupported media type",
+                error_code=ErrorCode.INVALID_INPUT,
+                status_code=400,
+                details={"file_extension": file_extension.lower()}
+            )
+        process, output_suffix, output_prefix, field, message = processor
         
         with tempfile.TemporaryDirectory() as temp_dir:
             # Download file from S3
             local_path = os.path.join(temp_dir, os.path.basename(key))
             s3_client.download_file(bucket, key, local_path)
             
-            if file_extension in ['.mp4', '.avi', '.mov']:
-                # Process video
-                output_filename = f"{os.path.splitext(os.path.basename(key))[0]}_preview.jpg"
-                output_path = os.path.join(temp_dir, output_filename)
-                process_video(local_path, output_path)
-                
-                # Upload preview to S3
-                s3_key = f"{VIDEO_PREVIEW_PREFIX}{output_filename}"
-                s3_client.upload_file(output_path, bucket, s3_key)
-                
-                preview_url = s3_client.generate_presigned_url(
-                    'get_object',
-                    Params={'Bucket': bucket, 'Key': s3_key},
-                    ExpiresIn=3600
-                )
-                
-                return {
-                    'statusCode': 200,
-                    'headers': get_cors_headers(),
-                    'body': json.dumps({
-                        'message': 'Video preview generated successfully',
-                        'preview_url': preview_url,
-                        'preview_key': s3_key
-                    })
-                }
-                
-            elif file_extension in ['.wav', '.mp3', '.m4a']:
-                # Process audio
-                output_filename = f"{os.path.splitext(os.path.basename(key))[0]}_waveform.jpg"
-                output_path = os.path.join(temp_dir, output_filename)
-                process_audio(local_path, output_path)
-                
-                # Upload waveform to S3
-                s3_key = f"{AUDIO_WAVEFORM_PREFIX}{output_filename}"
-                s3_client.upload_file(output_path, bucket, s3_key)
-                
-                waveform_url = s3_client.generate_presigned_url(
-                    'get_object',
-                    Params={'Bucket': bucket, 'Key': s3_key},
-                    ExpiresIn=3600
-                )
-                
-                return {
-                    'statusCode': 200,
-                    'headers': get_cors_headers(),
-                    'body': json.dumps({
-                        'message': 'Audio waveform generated successfully',
-                        'waveform_url': waveform_url,
-                        'waveform_key': s3_key
-                    })
-                }
-            else:
-                raise BirdTagError(
-                    message="Unsupported media type",
-                    error_code=ErrorCode.INVALID_INPUT,
-                    status_code=400,
-                    details={"file_extension": file_extension}
-                )
+            # Generate the video preview or audio waveform
+            output_filename = f"{base_name}{output_suffix}"
+            output_path = os.path.join(temp_dir, output_filename)
+            process(local_path, output_path)
+            
+            # Upload result to S3
+            s3_key = f"{output_prefix}{output_filename}"
+            s3_client.upload_file(output_path, bucket, s3_key)
+            
+            return {
+                'statusCode': 200,
+                'headers': get_cors_headers(),
+                'body': json.dumps({
+                    'message': message,
+                    f'{field}_url': generate_download_url(bucket, s3_key),
+                    f'{field}_key': s3_key
+                })
+            }
         
     except BirdTagError as e:
         logger.error(f"BirdTag Error: {str(e)}")
@@ -22,7 +22,8 @@ def get_cors_headers() -> Dict[str, str]:
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Handle model monitoring requests"""
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
         
         # Handle CORS preflight requests
         if event['httpMethod'] == 'OPTIONS':
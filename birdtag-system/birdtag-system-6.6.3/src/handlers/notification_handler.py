@@ -1,11 +1,17 @@
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import os
 
-sns = boto3.client('sns')
-dynamodb = boto3.resource('dynamodb')
+# One kept-alive config for both clients; standard retries absorb SNS
+# throttling on the per-subscription attribute lookups
+AWS_CONFIG = Config(tcp_keepalive=True, retries={'max_attempts': 3, 'mode': 'standard'})
+sns = boto3.client('sns', config=AWS_CONFIG)
+dynamodb = boto3.resource('dynamodb', config=AWS_CONFIG)
 SNS_TOPIC_ARN = os.environ['SNS_TOPIC']  # Set in your template
 SUBSCRIPTIONS_TABLE = os.environ.get('SUBSCRIPTIONS_TABLE')  # Optional for tracking
+subscriptions_table = dynamodb.Table(SUBSCRIPTIONS_TABLE) if SUBSCRIPTIONS_TABLE else None
 
 def lambda_handler(event, context):
     # Add CORS headers
@@ -47,12 +53,17 @@ def subscribe(event):
         Endpoint=email,
         Attributes={
             'FilterPolicy': json.dumps({'species': [species]})
-        }
+        },
+        ReturnSubscriptionArn=True
     )
-    # Store in DynamoDB for tracking
-    if SUBSCRIPTIONS_TABLE:
-        table = dynamodb.Table(SUBSCRIPTIONS_TABLE)
-        table.put_item(Item={'email': email, 'species': species})
+    # Store in DynamoDB for tracking, with the ARN so unsubscribe can skip
+    # listing the topic
+    if subscriptions_table:
+        subscriptions_table.put_item(Item={
+            'email': email,
+            'species': species,
+            'subscriptionArn': response['SubscriptionArn']
+        })
 
     return {'statusCode': 200, 'body': json.dumps({'message': 'Subscribed successfully'})}
 
@@ -63,20 +74,57 @@ def unsubscribe(event):
     if not email or not species:
         return {'statusCode': 400, 'body': json.dumps({'error': 'Missing email or species'})}
 
-    # List subscriptions and find the correct one to unsubscribe
-    subs = sns.list_subscriptions_by_topic(TopicArn=SNS_TOPIC_ARN)
-    for sub in subs['Subscriptions']:
-        if sub['Endpoint'] == email:
-            sns.unsubscribe(SubscriptionArn=sub['SubscriptionArn'])
-            break
+    subscription_arn = find_subscription_arn(email, species)
+    if subscription_arn:
+        try:
+            sns.unsubscribe(SubscriptionArn=subscription_arn)
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code == 'InvalidParameter':
+                # Not confirmed yet; SNS drops it if it stays unconfirmed,
+                # and the tracking row lets a later call remove it
+                return {'statusCode': 409, 'body': json.dumps({
+                    'error': 'Subscription is pending confirmation and cannot be removed yet'
+                })}
+            if code != 'NotFound':
+                raise
 
     # Remove from DynamoDB
-    if SUBSCRIPTIONS_TABLE:
-        table = dynamodb.Table(SUBSCRIPTIONS_TABLE)
-        table.delete_item(Key={'email': email, 'species': species})
+    if subscriptions_table:
+        subscriptions_table.delete_item(Key={'email': email, 'species': species})
 
     return {'statusCode': 200, 'body': json.dumps({'message': 'Unsubscribed successfully'})}
 
+def iter_topic_subscriptions():
+    # Every page of the topic's subscriptions, not just the first
+    for page in sns.get_paginator('list_subscriptions_by_topic').paginate(TopicArn=SNS_TOPIC_ARN):
+        yield from page['Subscriptions']
+
+def find_subscription_arn(email, species):
+    # Subscriptions made since ARNs were recorded are a single point read
+    if subscriptions_table:
+        item = subscriptions_table.get_item(Key={'email': email, 'species': species}).get('Item')
+        if item and item.get('subscriptionArn'):
+            return item['subscriptionArn']
+    
+    # Older ones fall back to listing the topic; pending confirmations have
+    # no ARN yet, and an email may hold one subscription per species
+    for sub in iter_topic_subscriptions():
+        if sub['Endpoint'] == email and sub['SubscriptionArn'].startswith('arn:'):
+            if species in subscription_species(sub['SubscriptionArn']):
+                return sub['SubscriptionArn']
+    return None
+
+def subscription_species(subscription_arn):
+    # Species in a subscription's filter policy; empty if it has none or
+    # was removed since the topic was listed
+    try:
+        attrs = sns.get_subscription_attributes(SubscriptionArn=subscription_arn)
+    except ClientError:
+        return []
+    filter_policy = attrs.get('Attributes', {}).get('FilterPolicy')
+    return json.loads(filter_policy).get('species', []) if filter_policy else []
+
 def get_subscriptions(event):
     query_params = event.get('queryStringParameters') or {}
     email = query_params.get('email', '')
@@ -84,9 +132,7 @@ def get_subscriptions(event):
         return {'statusCode': 400, 'body': json.dumps({'error': 'Email parameter required'})}
     
     subscriptions = []
-    subs = sns.list_subscriptions_by_topic(TopicArn=SNS_TOPIC_ARN)
-    
-    for sub in subs['Subscriptions']:
+    for sub in iter_topic_subscriptions():
         if sub['Endpoint'] == email and sub['Protocol'] == 'email':
             try:
                 attrs = sns.get_subscription_attributes(SubscriptionArn=sub['SubscriptionArn'])
@@ -1,7 +1,8 @@
 import boto3
+from botocore.config import Config
 import os
 import json
-from datetime import datetime
+import time
 import logging
 
 # Setup logger
@@ -9,17 +10,18 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialise DynamoDB
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=Config(tcp_keepalive=True))
 user_table = dynamodb.Table(os.environ['USER_TABLE_NAME'])
 
 # Initialise Cognito client
-cognito = boto3.client('cognito-idp')
+cognito = boto3.client('cognito-idp', config=Config(tcp_keepalive=True))
 USER_POOL_ID = os.environ['COGNITO_USER_POOL_ID']
 CLIENT_ID = os.environ['COGNITO_CLIENT_ID']
 
 def lambda_handler(event, context):
     try:
-        logger.info(f"Received event: {event}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
 
         email = event.get("email")
         name = event.get("name")
@@ -49,7 +51,7 @@ def lambda_handler(event, context):
             "email": email,
             "name": name,
             "userSub": user_sub,
-            "createdAt": datetime.utcnow().isoformat(),
+            "createdAt": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
             "role": "user",
             "status": "active"
         })
@@ -1,54 +1,199 @@
-import json
 import boto3
+from botocore.config import Config
 from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 import base64
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from decimal import Decimal
+from itertools import chain
+from queue import Empty, Queue
+from urllib.parse import unquote, urlparse
+
+import numpy as np
+import orjson
+
+from ..utils.dynamo_utils import parse_tag, species_bloom
 
-dynamodb = boto3.resource('dynamodb')
 TABLE_NAME = os.environ['DYNAMODB_TABLE']
 MEDIA_BUCKET = os.environ['MEDIA_BUCKET']
 
+# Scan filters for completed records with tags / a thumbnail; shared and
+# never mutated (iter_scan_pages serializes the values into a new dict)
+STATUS_NAMES = {'#status': 'status'}
+COMPLETED_VALUES = {':status': 'completed', ':zero': 0}
+COMPLETED_TAGGED_FILTER = '#status = :status AND size(tags) > :zero'
+COMPLETED_THUMBNAIL_FILTER = '#status = :status AND size(thumbnailUrl) > :zero'
+
+# Maximum segments for parallel scans, each read by its own worker thread;
+# kept global so warm invocations reuse the threads. Smaller tables use one
+# segment per SCAN_SEGMENT_BYTES (a full scan page) so no worker scans nothing
+SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', 8))
+SCAN_SEGMENT_BYTES = 1 << 20
+scan_executor = ThreadPoolExecutor(max_workers=SCAN_SEGMENTS)
+
+# One pooled, kept-alive connection per scan worker plus headroom for the
+# tag index queries, so concurrent requests never wait on or reopen TLS
+DYNAMODB_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=SCAN_SEGMENTS + 2,
+    retries={'max_attempts': 3, 'mode': 'standard'}
+)
+dynamodb = boto3.resource('dynamodb', config=DYNAMODB_CONFIG)
+table = dynamodb.Table(TABLE_NAME)
+
+# Thumbnail resolution reads through DAX when the function runs in the DAX
+# cluster's VPC and DAX_ENDPOINT is set; everything else reads DynamoDB
+DAX_ENDPOINT = os.environ.get('DAX_ENDPOINT')
+if DAX_ENDPOINT:
+    from amazondax import AmazonDaxClient
+    read_dynamodb = AmazonDaxClient.resource(endpoint_url=DAX_ENDPOINT)
+    read_table = read_dynamodb.Table(TABLE_NAME)
+else:
+    read_dynamodb, read_table = dynamodb, table
+
+# Scans go through a plain client (the resource's own client converts every
+# number to Decimal) and are deserialized with numbers as int/float
+dynamodb_client = boto3.client('dynamodb', config=DYNAMODB_CONFIG)
+scan_paginator = dynamodb_client.get_paginator('scan')
+
+class NumberDeserializer(TypeDeserializer):
+    """TypeDeserializer that returns int/float instead of Decimal"""
+    def _deserialize_n(self, value):
+        return float(value) if any(c in value for c in '.eE') else int(value)
+
+serializer = TypeSerializer()
+deserializer = NumberDeserializer()
+
+# Per-species tag index written by utils.dynamo_utils.sync_tag_index; tag
+# searches fall back to scanning the media table until it is configured and
+# TAG_INDEX_READY marks it as backfilled (see utils.backfill_tag_index)
+TAG_INDEX_TABLE = os.environ.get('TAG_INDEX_TABLE')
+TAG_INDEX_READY = os.environ.get('TAG_INDEX_READY') == 'true'
+tag_index = dynamodb.Table(TAG_INDEX_TABLE) if TAG_INDEX_TABLE and TAG_INDEX_READY else None
+TAG_COUNT_INDEX = 'species-count-index'
+THUMBNAIL_URL_INDEX = 'thumbnailUrl-index'
+
+# Tag index rows last returned per species, so multi-species searches can
+# start from the rarest species and stop as soon as nothing can match.
+# Species names come from requests, so only the most recent are kept
+SPECIES_FREQ_SIZE = 512
+_species_freq = OrderedDict()
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_SIZE = 100
+BATCH_GET_RETRIES = 5
+
+# Successful responses keyed by path and canonical request body, reused
+# across warm invocations for up to CACHE_TTL_SECONDS
+CACHE_TTL_SECONDS = int(os.environ.get('CACHE_TTL_SECONDS', 60))
+RESPONSE_CACHE_SIZE = 512
+_response_cache = OrderedDict()
+
+# Response headers shared by every response rather than rebuilt per call
+JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+CORS_HEADERS = {
+    **JSON_HEADERS,
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET'
+}
+POST_CORS_HEADERS = {**CORS_HEADERS, 'Access-Control-Allow-Methods': 'OPTIONS,POST'}
+
+def _json_default(obj):
+    # DynamoDB numbers come back as Decimal
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj):
+    """Serialize a response body with orjson"""
+    return orjson.dumps(obj, default=_json_default).decode()
+
+def error_response(status_code, message):
+    """Build a JSON error response"""
+    return {
+        'statusCode': status_code,
+        'headers': JSON_HEADERS,
+        'body': dumps({'error': message})
+    }
+
+def results_response(results, headers=CORS_HEADERS):
+    """Build a successful search response"""
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': dumps({'results': results})
+    }
+
+# Fixed error responses, serialized once at import time
+NOT_FOUND_RESPONSE = error_response(404, 'Not found')
+NO_TAGS_RESPONSE = error_response(400, 'No tags provided for search')
+NO_THUMBNAIL_URL_RESPONSE = error_response(400, 'Thumbnail URL is required')
+ORIGINAL_NOT_FOUND_RESPONSE = error_response(404, 'Original file not found')
+
 def lambda_handler(event, context):
     """Handle different types of search queries"""
     try:
         path = event['path']
         
-        if path == '/v1/search/tags':
-            return search_by_tags(event)
-        elif path == '/v1/search/species':
-            return search_by_species(event)
-        elif path == '/v1/search/thumbnails':
-            return search_by_thumbnails(event)
-        elif path == '/v1/search-by-file':
-            return search_by_file(event)
-        elif path == '/v1/resolve':
-            return resolve_thumbnail(event)
-        else:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'error': 'Not found'})
-            }
+        handler = ROUTES.get(path)
+        if handler is None:
+            return NOT_FOUND_RESPONSE
+        if path in CACHED_ROUTES:
+            return cached_response(path, event, handler)
+        return handler(event)
             
     except Exception as e:
         print(f"Error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        return error_response(500, str(e))
+
+def cached_response(path, event, handler):
+    """
+    Return handler(event), reusing a recent successful response to the same
+    request. Cached responses carry an ETag, and a client presenting it in
+    If-None-Match gets an empty 304 instead of the results again.
+    """
+    try:
+        cache_key = (path, orjson.dumps(orjson.loads(event['body']), option=orjson.OPT_SORT_KEYS))
+    except (KeyError, TypeError, ValueError):
+        return handler(event)
+    
+    now = time.monotonic()
+    cached = _response_cache.get(cache_key)
+    if cached and now - cached[0] < CACHE_TTL_SECONDS:
+        _response_cache.move_to_end(cache_key)
+        return not_modified(event, cached[1]) or cached[1]
+    
+    response = handler(event)
+    if response['statusCode'] == 200:
+        etag = '"%s"' % hashlib.md5(response['body'].encode()).hexdigest()
+        response = dict(response, headers=dict(response['headers'], ETag=etag))
+        _response_cache[cache_key] = (now, response)
+        _response_cache.move_to_end(cache_key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    return response
+
+def not_modified(event, response):
+    """Return a 304 if the request's If-None-Match holds the response's ETag, else None"""
+    headers = event.get('headers') or {}
+    if_none_match = headers.get('If-None-Match') or headers.get('if-none-match')
+    if if_none_match and response['headers']['ETag'] in if_none_match:
+        return {'statusCode': 304, 'headers': response['headers'], 'body': ''}
+    return None
 
 def search_by_tags(event):
     """Search files by bird tags with minimum counts"""
     try:
-        body = json.loads(event['body'])
+        body = orjson.loads(event['body'])
         
         # Parse search criteria
         search_criteria = {}
@@ -58,453 +203,434 @@ def search_by_tags(event):
                     search_criteria[bird] = count
                 else:
                     search_criteria[bird] = int(count) if count else 1
+        search_criteria = dict(rarest_first(search_criteria))
         
-        # Query database
-        table = dynamodb.Table(TABLE_NAME)
-        
-        # Build filter expression
-        filter_expressions = []
-        expression_attr_values = {}
-        expression_attr_names = {}
-        
-        # Add status filter
-        filter_expressions.append('#status = :status')
-        expression_attr_values[':status'] = 'completed'
-        expression_attr_names['#status'] = 'status'
-        
-        # Add tags filter if criteria exist
-        if search_criteria:
-            filter_expressions.append('attribute_exists(tags)')
-        
-        # Combine filter expressions
-        filter_expression = ' AND '.join(filter_expressions)
-        
-        # Scan with filter
-        response = table.scan(
-            FilterExpression=filter_expression,
-            ExpressionAttributeValues=expression_attr_values,
-            ExpressionAttributeNames=expression_attr_names
-        )
-        items = response['Items']
+        if search_criteria and tag_index is not None:
+            return results_response(query_tag_index(search_criteria))
         
-        # Continue scanning if there are more items
-        while 'LastEvaluatedKey' in response:
-            response = table.scan(
-                FilterExpression=filter_expression,
-                ExpressionAttributeValues=expression_attr_values,
-                ExpressionAttributeNames=expression_attr_names,
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response['Items'])
+        # Scan all segments concurrently, matching each page as it arrives
+        pages = parallel_scan_pages(**completed_tagged_scan('fileKey, fileUrl, tags, tagMap, speciesBloom'))
         
         # Filter and process results
+        # Items missing any searched species' bit are dropped in one
+        # vectorized pass per page before tag matching; records written
+        # before speciesBloom are always checked
+        query_bloom = np.uint64(species_bloom(search_criteria))
         matching_files = []
-        for item in items:
-            if not item.get('tags'):
-                continue
-                
-            if matches_criteria(item['tags'], search_criteria):
-                file_url = item.get('fileUrl', '')
-                matching_files.append({
-                    'fileUrl': file_url,
-                    'fileKey': item.get('fileKey', ''),
-                    'tags': item.get('tags', [])
-                })
+        for items in pages:
+            blooms = np.fromiter(
+                (item.get('speciesBloom', query_bloom) for item in items),
+                dtype=np.uint64,
+                count=len(items)
+            )
+            candidates = np.flatnonzero((blooms & query_bloom) == query_bloom)
+            for item in map(items.__getitem__, candidates):
+                if matches_criteria(item, search_criteria):
+                    matching_files.append(tagged_file(item))
         
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                'Access-Control-Allow-Methods': 'OPTIONS,POST,GET'
-            },
-            'body': json.dumps({
-                'results': matching_files
-            }, cls=DecimalEncoder)
-        }
+        return results_response(matching_files)
         
     except Exception as e:
         print(f"Search by tags error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        return error_response(500, str(e))
 
 def search_by_species(event):
     """Search files by species names"""
     try:
-        body = json.loads(event['body'])
+        body = orjson.loads(event['body'])
         
         # Parse species search
         search_species = set()
         if 'species' in body:
             search_species = set(body['species'])
         
-        # Query database
-        table = dynamodb.Table(TABLE_NAME)
-        
-        # Build filter expression
-        filter_expressions = []
-        expression_attr_values = {}
-        expression_attr_names = {}
+        items = files_with_any_species(search_species, 'fileKey, fileUrl, tags, speciesSet')
+        matching_files = [tagged_file(item) for item in items]
         
-        # Add status filter
-        filter_expressions.append('#status = :status')
-        expression_attr_values[':status'] = 'completed'
-        expression_attr_names['#status'] = 'status'
-        
-        # Add tags filter
-        filter_expressions.append('attribute_exists(tags)')
-        
-        # Combine filter expressions
-        filter_expression = ' AND '.join(filter_expressions)
-        
-        # Scan with filter
-        response = table.scan(
-            FilterExpression=filter_expression,
-            ExpressionAttributeValues=expression_attr_values,
-            ExpressionAttributeNames=expression_attr_names
-        )
-        items = response['Items']
-        
-        # Continue scanning if there are more items
-        while 'LastEvaluatedKey' in response:
-            response = table.scan(
-                FilterExpression=filter_expression,
-                ExpressionAttributeValues=expression_attr_values,
-                ExpressionAttributeNames=expression_attr_names,
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response['Items'])
-        
-        # Filter and process results
-        matching_files = []
-        for item in items:
-            if not item.get('tags'):
-                continue
-                
-            if has_any_matching_species(item['tags'], search_species):
-                file_url = item.get('fileUrl', '')
-                matching_files.append({
-                    'fileUrl': file_url,
-                    'fileKey': item.get('fileKey', ''),
-                    'tags': item.get('tags', [])
-                })
-        
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                'Access-Control-Allow-Methods': 'OPTIONS,POST,GET'
-            },
-            'body': json.dumps({
-                'results': matching_files
-            }, cls=DecimalEncoder)
-        }
+        return results_response(matching_files)
         
     except Exception as e:
         print(f"Search by species error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        return error_response(500, str(e))
 
 def search_by_thumbnails(event):
     """Search files with available thumbnails"""
     try:
-        # Query database
-        table = dynamodb.Table(TABLE_NAME)
-        
-        # Build filter expression
-        filter_expressions = []
-        expression_attr_values = {}
-        expression_attr_names = {}
-        
-        # Add status filter
-        filter_expressions.append('#status = :status')
-        expression_attr_values[':status'] = 'completed'
-        expression_attr_names['#status'] = 'status'
-        
-        # Add thumbnail filter
-        filter_expressions.append('attribute_exists(thumbnailUrl)')
-        
-        # Combine filter expressions
-        filter_expression = ' AND '.join(filter_expressions)
-        
-        # Scan with filter
-        response = table.scan(
-            FilterExpression=filter_expression,
-            ExpressionAttributeValues=expression_attr_values,
-            ExpressionAttributeNames=expression_attr_names
+        # Scan all segments concurrently
+        items = parallel_scan(
+            FilterExpression=COMPLETED_THUMBNAIL_FILTER,
+            ExpressionAttributeValues=COMPLETED_VALUES,
+            ExpressionAttributeNames=STATUS_NAMES,
+            ProjectionExpression='fileKey, fileUrl, thumbnailUrl, tags'
         )
-        items = response['Items']
-        
-        # Continue scanning if there are more items
-        while 'LastEvaluatedKey' in response:
-            response = table.scan(
-                FilterExpression=filter_expression,
-                ExpressionAttributeValues=expression_attr_values,
-                ExpressionAttributeNames=expression_attr_names,
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response['Items'])
         
         # Process results
-        matching_files = []
-        for item in items:
-            file_url = item.get('fileUrl', '')
-            thumbnail_url = item.get('thumbnailUrl', '')
-            
-            if thumbnail_url:
-                matching_files.append({
-                    'thumbnailUrl': thumbnail_url,
-                    'fileUrl': file_url,
-                    'fileKey': item.get('fileKey', ''),
-                    'tags': item.get('tags', [])
-                })
+        matching_files = [dict(tagged_file(item), thumbnailUrl=item['thumbnailUrl']) for item in items]
         
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                'Access-Control-Allow-Methods': 'OPTIONS,POST,GET'
-            },
-            'body': json.dumps({
-                'results': matching_files
-            }, cls=DecimalEncoder)
-        }
+        return results_response(matching_files)
         
     except Exception as e:
         print(f"Search by thumbnails error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        return error_response(500, str(e))
 
 def search_by_file(event):
     """Search by tags provided for an uploaded file and find similar tagged files"""
     try:
-        body = json.loads(event['body'])
+        body = orjson.loads(event['body'])
         
         # Expecting tags in the request body
         search_tags = set()
         if 'tags' in body:
             search_tags = set(body['tags'])  # e.g., ["crow", "pigeon"]
         else:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'error': 'No tags provided for search'})
-            }
-        
-        # Query database
-        table = dynamodb.Table(TABLE_NAME)
-        filter_expressions = []
-        expression_attr_values = {}
-        expression_attr_names = {}
-        
-        filter_expressions.append('#status = :status')
-        expression_attr_values[':status'] = 'completed'
-        expression_attr_names['#status'] = 'status'
-        filter_expressions.append('attribute_exists(tags)')
-        filter_expression = ' AND '.join(filter_expressions)
+            return NO_TAGS_RESPONSE
         
-        response = table.scan(
-            FilterExpression=filter_expression,
-            ExpressionAttributeValues=expression_attr_values,
-            ExpressionAttributeNames=expression_attr_names
-        )
-        items = response['Items']
-        
-        # Continue scanning if there are more items
-        while 'LastEvaluatedKey' in response:
-            response = table.scan(
-                FilterExpression=filter_expression,
-                ExpressionAttributeValues=expression_attr_values,
-                ExpressionAttributeNames=expression_attr_names,
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response['Items'])
+        items = files_with_any_species(search_tags, 'fileKey, fileUrl, thumbnailUrl, tags, speciesSet')
         
-        # Find files with ANY of these tags/species
-        matching_files = []
-        for item in items:
-            if not item.get('tags'):
-                continue
-            if has_any_matching_species(item['tags'], search_tags):
-                file_url = item.get('fileUrl', '')
-                thumbnail_url = item.get('thumbnailUrl', '')
-                matching_files.append({
-                    'fileUrl': file_url,
-                    'thumbnailUrl': thumbnail_url,
-                    'fileKey': item.get('fileKey', ''),
-                    'tags': item.get('tags', [])
-                })
+        # Files with ANY of these tags/species
+        matching_files = [
+            dict(tagged_file(item), thumbnailUrl=item.get('thumbnailUrl', ''))
+            for item in items
+        ]
         
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                'Access-Control-Allow-Methods': 'OPTIONS,POST'
-            },
-            'body': json.dumps({
-                'results': matching_files
-            }, cls=DecimalEncoder)
-        }
+        return results_response(matching_files, POST_CORS_HEADERS)
         
     except Exception as e:
         print(f"Search by file error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        return error_response(500, str(e))
 
 def resolve_thumbnail(event):
     """Resolve thumbnail URL to full-size image URL"""
     try:
-        body = json.loads(event['body'])
-        thumbnail_url = body.get('thumbnailUrl', '').strip()
-        
-        if not thumbnail_url:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'error': 'Thumbnail URL is required'})
-            }
+        body = orjson.loads(event['body'])
         
-        # Extract key from thumbnail URL
-        original_key = None
-        
-        # Method 1: If URL contains 'thumbnails/' prefix
-        if 'thumbnails/' in thumbnail_url:
-            # Parse the URL to get the thumbnail key
-            if '.amazonaws.com/' in thumbnail_url:
-                parts = thumbnail_url.split('.amazonaws.com/')
-                if len(parts) > 1:
-                    thumbnail_key = parts[1]
-                    # Convert thumbnail key to original key by replacing prefix
-                    original_key = thumbnail_key.replace('thumbnails/', 'uploads/')
-        
-        # Method 2: Search in database by thumbnail URL
-        if not original_key:
-            table = dynamodb.Table(TABLE_NAME)
-            response = table.scan(
-                FilterExpression=Attr('thumbnailUrl').eq(thumbnail_url)
+        # Batch form: resolve many thumbnails in as few round trips as possible
+        if 'thumbnailUrls' in body:
+            return results_response(
+                resolve_thumbnails([url.strip() for url in body['thumbnailUrls'] if url]),
+                JSON_HEADERS
             )
-            
-            if response['Items']:
-                item = response['Items'][0]
-                return {
-                    'statusCode': 200,
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'Access-Control-Allow-Origin': '*'
-                    },
-                    'body': json.dumps({
-                        'originalUrl': item.get('fileUrl', ''),
-                        'fileKey': item.get('fileKey', '')
-                    })
-                }
-        else:
-            # Query database for original file using the key
-            table = dynamodb.Table(TABLE_NAME)
-            response = table.get_item(Key={'fileKey': original_key})
-            
-            if 'Item' in response:
-                return {
-                    'statusCode': 200,
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'Access-Control-Allow-Origin': '*'
-                    },
-                    'body': json.dumps({
-                        'originalUrl': response['Item'].get('fileUrl', ''),
-                        'fileKey': original_key
-                    })
-                }
         
+        thumbnail_url = body.get('thumbnailUrl', '').strip()
+        
+        if not thumbnail_url:
+            return NO_THUMBNAIL_URL_RESPONSE
+        
+        # Method 1: Derive the original key from the thumbnail URL
+        item = None
+        original_key = thumbnail_original_key(thumbnail_url)
+        if original_key:
+            item = read_table.get_item(
+                Key={'fileKey': original_key},
+                ProjectionExpression='fileKey, fileUrl'
+            ).get('Item')
+        
+        # Method 2: Look up the thumbnail URL in its index; originals moved
+        # since upload (e.g. into species/ folders) are only found this way
+        if item is None:
+            item = query_thumbnail_url(thumbnail_url)
+        
+        if item is None:
+            return ORIGINAL_NOT_FOUND_RESPONSE
         return {
-            'statusCode': 404,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': 'Original file not found'})
+            'statusCode': 200,
+            'headers': JSON_HEADERS,
+            'body': dumps({
+                'originalUrl': item.get('fileUrl', ''),
+                'fileKey': item.get('fileKey', '')
+            })
         }
         
     except Exception as e:
         print(f"Resolve error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': str(e)})
+        return error_response(500, str(e))
+
+def thumbnail_original_key(thumbnail_url):
+    """
+    Map a thumbnails/ URL to its original's uploads/ key, or None. Handles
+    virtual-hosted and path-style S3 URLs, presigned URLs and CloudFront
+    URLs serving the bucket root
+    """
+    path = unquote(urlparse(thumbnail_url).path).lstrip('/')
+    if not path.startswith('thumbnails/'):
+        # Path-style URLs put the bucket name first
+        path = path.partition('/')[2]
+    if path.startswith('thumbnails/'):
+        return 'uploads/' + path[len('thumbnails/'):]
+    return None
+
+def query_thumbnail_url(thumbnail_url):
+    """Return fileKey/fileUrl of the record with this thumbnail URL, or None"""
+    response = read_table.query(
+        IndexName=THUMBNAIL_URL_INDEX,
+        KeyConditionExpression=Key('thumbnailUrl').eq(thumbnail_url),
+        ProjectionExpression='fileKey, fileUrl',
+        Limit=1
+    )
+    return response['Items'][0] if response['Items'] else None
+
+def batch_get_files(file_keys):
+    """Fetch fileKey/fileUrl for many records with BatchGetItem, 100 keys per call"""
+    items = []
+    file_keys = list(dict.fromkeys(file_keys))
+    for start in range(0, len(file_keys), BATCH_GET_SIZE):
+        request = {TABLE_NAME: {
+            'Keys': [{'fileKey': key} for key in file_keys[start:start + BATCH_GET_SIZE]],
+            'ProjectionExpression': 'fileKey, fileUrl'
+        }}
+        for attempt in range(BATCH_GET_RETRIES):
+            response = read_dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response['Responses'].get(TABLE_NAME, []))
+            request = response.get('UnprocessedKeys')
+            if not request:
+                break
+            time.sleep(0.05 * 2 ** attempt)
+        else:
+            raise RuntimeError(f"{len(request[TABLE_NAME]['Keys'])} keys left unprocessed by BatchGetItem")
+    return items
+
+def resolve_thumbnails(thumbnail_urls):
+    """Resolve many thumbnail URLs, skipping any without an original"""
+    derived = {url: thumbnail_original_key(url) for url in thumbnail_urls}
+    originals = {
+        item['fileKey']: item.get('fileUrl', '')
+        for item in batch_get_files(key for key in derived.values() if key)
+    }
+    
+    results = []
+    for url, original_key in derived.items():
+        if original_key in originals:
+            results.append({
+                'thumbnailUrl': url,
+                'originalUrl': originals[original_key],
+                'fileKey': original_key
+            })
+            continue
+        # Not derivable, or the original has moved: use the thumbnail index
+        item = query_thumbnail_url(url)
+        if item is not None:
+            results.append({
+                'thumbnailUrl': url,
+                'originalUrl': item.get('fileUrl', ''),
+                'fileKey': item.get('fileKey', '')
+            })
+    return results
+
+def completed_tagged_scan(projection):
+    """Scan parameters selecting completed, tagged records with the given projection"""
+    return {
+        'FilterExpression': COMPLETED_TAGGED_FILTER,
+        'ExpressionAttributeNames': STATUS_NAMES,
+        'ExpressionAttributeValues': COMPLETED_VALUES,
+        'ProjectionExpression': projection
+    }
+
+def tagged_file(item):
+    """Result entry for a matched record"""
+    return {
+        'fileUrl': item.get('fileUrl', ''),
+        'fileKey': item.get('fileKey', ''),
+        'tags': item.get('tags', [])
+    }
+
+def iter_scan_pages(**scan_params):
+    """
+    Yield each page of items of a media table scan as it is read, with
+    numbers as plain int/float. Pages are left at DynamoDB's 1 MB maximum;
+    a smaller PageSize would only add round trips
+    """
+    if 'ExpressionAttributeValues' in scan_params:
+        scan_params['ExpressionAttributeValues'] = {
+            name: serializer.serialize(value)
+            for name, value in scan_params['ExpressionAttributeValues'].items()
+        }
+    for page in scan_paginator.paginate(TableName=TABLE_NAME, **scan_params):
+        yield [
+            {name: deserializer.deserialize(value) for name, value in item.items()}
+            for item in page['Items']
+        ]
+
+def iter_scan(**scan_params):
+    """Yield the items of a media table scan one page at a time"""
+    return chain.from_iterable(iter_scan_pages(**scan_params))
+
+@lru_cache(maxsize=None)
+def scan_segment_count():
+    """Segments for the media table, from its size as of this container's first scan"""
+    table_bytes = dynamodb_client.describe_table(TableName=TABLE_NAME)['Table']['TableSizeBytes']
+    return max(1, min(SCAN_SEGMENTS, table_bytes // SCAN_SEGMENT_BYTES))
+
+def scan_segment(segment, total_segments, scan_params, pages, stop):
+    """Read one parallel scan segment, handing each page over as it arrives and None when done"""
+    try:
+        for page in iter_scan_pages(**scan_params, Segment=segment, TotalSegments=total_segments):
+            if stop.is_set():
+                return
+            pages.put(page)
+    finally:
+        pages.put(None)
+
+def parallel_scan_pages(**scan_params):
+    """
+    Scan the media table with one worker per segment, yielding pages as the
+    workers read them. The queue holds two pages per worker, so a slow
+    consumer holds back the scan rather than buffering whole segments
+    """
+    total_segments = scan_segment_count()
+    pages = Queue(maxsize=2 * total_segments)
+    stop = threading.Event()
+    futures = [
+        scan_executor.submit(scan_segment, segment, total_segments, scan_params, pages, stop)
+        for segment in range(total_segments)
+    ]
+    try:
+        remaining = total_segments
+        while remaining:
+            page = pages.get()
+            if page is None:
+                remaining -= 1
+            else:
+                yield page
+        # Re-raise a failed segment's error
+        for future in futures:
+            future.result()
+    finally:
+        # Unblock workers still waiting to hand over a page
+        stop.set()
+        while not all(future.done() for future in futures):
+            try:
+                pages.get(timeout=0.05)
+            except Empty:
+                pass
+
+def parallel_scan(**scan_params):
+    """Scan the media table with one worker per segment and return all items"""
+    return list(chain.from_iterable(parallel_scan_pages(**scan_params)))
+
+def query_species_rows(species, min_count=None):
+    """Return tag index rows for files with at least min_count of species, or with any count if None"""
+    query_params = {
+        'KeyConditionExpression': Key('species').eq(species),
+        'FilterExpression': Attr('status').eq('completed'),
+        'ProjectionExpression': 'fileKey, fileUrl, thumbnailUrl, tags'
+    }
+    if min_count is not None:
+        # The count index only holds rows with a count, so use it only
+        # when there is a bound to apply
+        query_params['IndexName'] = TAG_COUNT_INDEX
+        query_params['KeyConditionExpression'] &= Key('count').gte(min_count)
+    rows = []
+    while True:
+        response = tag_index.query(**query_params)
+        rows.extend(response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return rows
+        query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def rarest_first(search_criteria):
+    """Order (species, min_count) criteria by how few files each matched last time"""
+    return sorted(search_criteria.items(), key=lambda criterion: _species_freq.get(criterion[0], 0))
+
+def files_with_any_species(search_species, projection):
+    """
+    Records having any of the species: tag index rows when the index is
+    configured, otherwise completed media records scanned with projection
+    """
+    # Nothing can match an empty species list, so skip the reads
+    if not search_species:
+        return []
+    if tag_index is not None:
+        return query_any_species(search_species)
+    items = parallel_scan(**completed_tagged_scan(projection))
+    return [item for item in items if has_any_matching_species(item, search_species)]
+
+def query_any_species(search_species):
+    """Return one tag index row per file having any of the species, querying species concurrently"""
+    rows_per_species = scan_executor.map(query_species_rows, search_species)
+    rows = {}
+    for row in chain.from_iterable(rows_per_species):
+        rows.setdefault(row['fileKey'], row)
+    return list(rows.values())
+
+def query_tag_index(search_criteria):
+    """Find files meeting every species/minimum count criterion via the tag index"""
+    first_rows = None
+    matching_keys = None
+    for species, min_count in search_criteria.items():
+        rows = query_species_rows(species, min_count)
+        _species_freq[species] = len(rows)
+        _species_freq.move_to_end(species)
+        if len(_species_freq) > SPECIES_FREQ_SIZE:
+            _species_freq.popitem(last=False)
+        keys = {row['fileKey'] for row in rows}
+        if first_rows is None:
+            first_rows, matching_keys = rows, keys
+        else:
+            matching_keys &= keys
+        if not matching_keys:
+            return []
+    
+    # Every row carries the file's URL and tags, so any one species' rows
+    # are enough to build the results
+    return [
+        {
+            'fileUrl': row.get('fileUrl', ''),
+            'fileKey': row['fileKey'],
+            'tags': row.get('tags', [])
         }
+        for row in first_rows
+        if row['fileKey'] in matching_keys
+    ]
+
+def tag_counts(item):
+    """Return an item's {species: count}, parsing its tags once if it predates tagMap"""
+    if 'tagMap' not in item:
+        parsed = (parse_tag(tag) for tag in item['tags'])
+        item['tagMap'] = dict(tag for tag in parsed if tag)
+    return item['tagMap']
+
+def matches_criteria(item, search_criteria):
+    """Check if file has every searched species with at least the requested count"""
+    counts = tag_counts(item)
+    return all(counts.get(species, 0) >= min_count for species, min_count in search_criteria.items())
 
-def has_any_matching_species(file_tags, search_species):
+def has_any_matching_species(item, search_species):
     """Check if file has any of the species we're searching for"""
-    for tag in file_tags:
-        if ',' in tag:
-            species, _ = tag.split(',', 1)
-            if species.strip() in search_species:
-                return True
-    return False
+    if not search_species:
+        return False
+    if 'speciesSet' in item:
+        return not item['speciesSet'].isdisjoint(search_species)
+    return not tag_counts(item).keys().isdisjoint(search_species)
+
+# Suffix tuples for str.endswith, which checks every suffix in one C call
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.m4a', '.flac')
+EXTENSION_TAIL = max(map(len, IMAGE_EXTENSIONS + VIDEO_EXTENSIONS + AUDIO_EXTENSIONS))
+
+def url_tail(url):
+    """Lower-cased end of a URL's path, just long enough to hold any extension"""
+    return url.partition('?')[0][-EXTENSION_TAIL:].lower()
 
 def is_image_file(url):
     """Check if URL points to an image file"""
-    if not url:
-        return False
-    lower_url = url.lower()
-    return any(lower_url.endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp'])
+    return bool(url) and url_tail(url).endswith(IMAGE_EXTENSIONS)
 
 def is_video_file(url):
     """Check if URL points to a video file"""
-    if not url:
-        return False
-    lower_url = url.lower()
-    return any(lower_url.endswith(ext) for ext in ['.mp4', '.avi', '.mov', '.mkv', '.webm'])
+    return bool(url) and url_tail(url).endswith(VIDEO_EXTENSIONS)
 
 def is_audio_file(url):
     """Check if URL points to an audio file"""
-    if not url:
-        return False
-    lower_url = url.lower()
-    return any(lower_url.endswith(ext) for ext in ['.mp3', '.wav', '.m4a', '.flac'])
-
-# Decimal encoder for DynamoDB responses
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, Decimal):
-            return float(o)
-        return super(DecimalEncoder, self).default(o)
+    return bool(url) and url_tail(url).endswith(AUDIO_EXTENSIONS)
+
+# Search routes by API path; responses to those in CACHED_ROUTES are reused
+# through cached_response
+ROUTES = {
+    '/v1/search/tags': search_by_tags,
+    '/v1/search/species': search_by_species,
+    '/v1/search/thumbnails': search_by_thumbnails,
+    '/v1/search-by-file': search_by_file,
+    '/v1/resolve': resolve_thumbnail
+}
+CACHED_ROUTES = frozenset(ROUTES) - {'/v1/search/thumbnails'}
@@ -2,8 +2,11 @@ import json
 import logging
 from typing import Dict, Any
 
+import orjson
+
 from utils.auth_utils import require_auth
 from utils.dynamo_utils import (
+    decimal_default,
     get_user_stats,
     get_system_stats,
     get_species_stats
@@ -26,7 +29,8 @@ def get_cors_headers() -> Dict[str, str]:
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Handle statistics requests"""
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
         
         # Handle CORS preflight requests
         if event['httpMethod'] == 'OPTIONS':
@@ -78,7 +82,7 @@ def handle_user_stats(user_data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             'statusCode': 200,
             'headers': get_cors_headers(),
-            'body': json.dumps(stats)
+            'body': orjson.dumps(stats, default=decimal_default).decode()
         }
         
     except BirdTagError as e:
@@ -101,7 +105,7 @@ def handle_system_stats() -> Dict[str, Any]:
         return {
             'statusCode': 200,
             'headers': get_cors_headers(),
-            'body': json.dumps(stats)
+            'body': orjson.dumps(stats, default=decimal_default).decode()
         }
         
     except BirdTagError as e:
@@ -124,7 +128,7 @@ def handle_species_stats(species: str) -> Dict[str, Any]:
         return {
             'statusCode': 200,
             'headers': get_cors_headers(),
-            'body': json.dumps(stats)
+            'body': orjson.dumps(stats, default=decimal_default).decode()
         }
         
     except BirdTagError as e:
@@ -1,10 +1,13 @@
+import io
 import json
 import os
-import tempfile
 import logging
 from typing import Dict, Any, Tuple
 import boto3
+import cv2
+import numpy as np
 from PIL import Image
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 # Configure logging
@@ -12,7 +15,7 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-s3_client = boto3.client('s3')
+s3_client = boto3.client('s3', config=Config(tcp_keepalive=True))
 
 # Environment variables
 MEDIA_BUCKET = os.environ.get('MEDIA_BUCKET')
@@ -20,6 +23,25 @@ THUMBNAIL_PREFIX = os.environ.get('THUMBNAIL_PREFIX', 'thumbnails/')
 MAX_THUMBNAIL_SIZE = int(os.environ.get('MAX_THUMBNAIL_SIZE', 200))
 THUMBNAIL_QUALITY = int(os.environ.get('THUMBNAIL_QUALITY', 75))
 
+# Thumbnail metadata key holding the ETag of the image it was made from
+SOURCE_ETAG_METADATA = 'source-etag'
+
+# Baseline, non-optimized JPEG: the extra Huffman pass buys only a few
+# bytes on a 200px thumbnail
+JPEG_ENCODE_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_QUALITY,
+    cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+    cv2.IMWRITE_JPEG_PROGRESSIVE, 0
+]
+
+# Shrink-on-load read flags, largest first; for JPEG, libjpeg scales the
+# DCT during decode so the full-resolution image is never materialized
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2)
+)
+
 def get_cors_headers() -> Dict[str, str]:
     """Return CORS headers for HTTP responses."""
     return {
@@ -28,44 +50,111 @@ def get_cors_headers() -> Dict[str, str]:
         'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
     }
 
-def create_thumbnail(image_path: str) -> Tuple[str, str]:
+def get_thumbnail_size(width: int, height: int) -> Tuple[int, int]:
+    """
+    Scale dimensions so the longer side is at most MAX_THUMBNAIL_SIZE.
+    
+    Args:
+        width (int): Source image width
+        height (int): Source image height
+        
+    Returns:
+        tuple: (thumbnail width, thumbnail height)
+    """
+    if width > height:
+        new_width = min(width, MAX_THUMBNAIL_SIZE)
+        new_height = int(height * (new_width / width))
+    else:
+        new_height = min(height, MAX_THUMBNAIL_SIZE)
+        new_width = int(width * (new_height / height))
+    return new_width, new_height
+
+def get_decode_flag(image_bytes: bytes) -> int:
+    """
+    Pick the OpenCV read flag that shrinks the image on load as far as
+    possible while keeping its longer side at least MAX_THUMBNAIL_SIZE.
+    
+    Args:
+        image_bytes (bytes): Encoded source image
+        
+    Returns:
+        int: cv2.IMREAD_* flag
+    """
+    try:
+        # Pillow opens lazily, so this parses only the header
+        with Image.open(io.BytesIO(image_bytes)) as probe:
+            longest = max(probe.size)
+    except Exception:
+        return cv2.IMREAD_COLOR
+    
+    for factor, flag in REDUCED_DECODE_FLAGS:
+        if longest // factor >= MAX_THUMBNAIL_SIZE:
+            return flag
+    return cv2.IMREAD_COLOR
+
+def create_thumbnail(image_bytes: bytes) -> Tuple[bytes, str]:
     """
     Create a thumbnail from the given image.
     
     Args:
-        image_path (str): Path to the source image
+        image_bytes (bytes): Encoded source image
         
     Returns:
-        tuple: (thumbnail path, content type)
+        tuple: (thumbnail JPEG bytes, content type)
     """
     try:
-        # Open the image
-        with Image.open(image_path) as img:
-            # Convert to RGB if necessary
-            if img.mode in ('RGBA', 'P'):
+        # JPEG, PNG, WebP and BMP decode straight into OpenCV, at a reduced
+        # scale whenever the source is several times the thumbnail size
+        pixels = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), get_decode_flag(image_bytes))
+        if pixels is not None:
+            height, width = pixels.shape[:2]
+            # Box-filter downscale with OpenCV's SIMD kernels
+            thumbnail = cv2.resize(pixels, get_thumbnail_size(width, height), interpolation=cv2.INTER_AREA)
+            ok, encoded = cv2.imencode('.jpg', thumbnail, JPEG_ENCODE_PARAMS)
+            if ok:
+                return encoded.tobytes(), 'image/jpeg'
+        
+        # Formats OpenCV cannot decode (e.g. GIF) go through Pillow
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # JPEGs that land here (e.g. CMYK) decode DCT-scaled to no less
+            # than twice the target; other formats ignore the draft request
+            img.draft('RGB', (MAX_THUMBNAIL_SIZE * 2, MAX_THUMBNAIL_SIZE * 2))
+            if img.mode != 'RGB':
                 img = img.convert('RGB')
+            # thumbnail() box-reduces by an integer factor before the
+            # LANCZOS pass and keeps the aspect ratio like get_thumbnail_size
+            img.thumbnail((MAX_THUMBNAIL_SIZE, MAX_THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
             
-            # Calculate new dimensions while maintaining aspect ratio
-            width, height = img.size
-            if width > height:
-                new_width = min(width, MAX_THUMBNAIL_SIZE)
-                new_height = int(height * (new_width / width))
-            else:
-                new_height = min(height, MAX_THUMBNAIL_SIZE)
-                new_width = int(width * (new_height / height))
-            
-            # Resize image
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Save thumbnail to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-                img.save(tmp_file.name, 'JPEG', quality=THUMBNAIL_QUALITY)
-                return tmp_file.name, 'image/jpeg'
+            # Encode thumbnail in memory
+            output = io.BytesIO()
+            img.save(output, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=False, progressive=False)
+            return output.getvalue(), 'image/jpeg'
                 
     except Exception as e:
         logger.error(f"Error creating thumbnail: {str(e)}")
         raise
 
+def thumbnail_exists(bucket: str, thumbnail_key: str, source_etag: str) -> bool:
+    """
+    Check whether a thumbnail has already been written from this version
+    of the source image.
+    
+    Args:
+        bucket (str): S3 bucket name
+        thumbnail_key (str): Thumbnail object key
+        source_etag (str): ETag of the source image, without quotes
+        
+    Returns:
+        bool: True if the thumbnail exists and records the same source ETag
+    """
+    try:
+        metadata = s3_client.head_object(Bucket=bucket, Key=thumbnail_key)['Metadata']
+        return metadata.get(SOURCE_ETAG_METADATA) == source_etag
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return False
+        raise
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda function handler for generating thumbnails.
@@ -78,7 +167,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         dict: Response with processing results
     """
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", json.dumps(event, default=str))
         
         # Handle CORS preflight requests
         if event.get('httpMethod') == 'OPTIONS':
@@ -96,11 +186,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if 'Records' in event and event['Records'][0]['eventSource'] == 'aws:s3':
             bucket = event['Records'][0]['s3']['bucket']['name']
             key = event['Records'][0]['s3']['object']['key']
+            source_etag = event['Records'][0]['s3']['object'].get('eTag')
         else:
             # Handle API Gateway request
             body = json.loads(event.get('body', '{}'))
             bucket = body.get('bucket')
             key = body.get('key')
+            source_etag = None
             if not bucket or not key:
                 return {
                     'statusCode': 400,
@@ -110,40 +202,49 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     })
                 }
         
-        # Download image to temp file
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as tmp_file:
-            s3_client.download_file(bucket, key, tmp_file.name)
-            
-            # Create thumbnail
-            thumbnail_path, content_type = create_thumbnail(tmp_file.name)
-            
-            # Generate thumbnail key
-            filename = os.path.basename(key)
-            thumbnail_key = f"{THUMBNAIL_PREFIX}{filename}"
-            
-            # Upload thumbnail to S3
-            with open(thumbnail_path, 'rb') as thumbnail_file:
-                s3_client.upload_fileobj(
-                    thumbnail_file,
-                    bucket,
-                    thumbnail_key,
-                    ExtraArgs={
-                        'ContentType': content_type,
-                        'CacheControl': 'max-age=31536000'
-                    }
-                )
-            
-            # Clean up temporary files
-            os.unlink(thumbnail_path)
-            
+        # Generate thumbnail key
+        filename = os.path.basename(key)
+        thumbnail_key = f"{THUMBNAIL_PREFIX}{filename}"
+        
+        # Replayed S3 notifications find the thumbnail already written; an
+        # overwritten source has a new ETag and is processed again
+        if not source_etag:
+            source_etag = s3_client.head_object(Bucket=bucket, Key=key)['ETag']
+        if thumbnail_exists(bucket, thumbnail_key, source_etag.strip('"')):
             return {
                 'statusCode': 200,
                 'headers': get_cors_headers(),
                 'body': json.dumps({
-                    'message': 'Thumbnail generated successfully',
+                    'message': 'Thumbnail already exists',
                     'thumbnail_key': thumbnail_key
                 })
             }
+        
+        # Read image straight into memory rather than staging it in /tmp
+        source = s3_client.get_object(Bucket=bucket, Key=key)
+        image_bytes = source['Body'].read()
+        
+        # Create thumbnail
+        thumbnail_bytes, content_type = create_thumbnail(image_bytes)
+        
+        # Upload thumbnail to S3
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=thumbnail_key,
+            Body=thumbnail_bytes,
+            ContentType=content_type,
+            CacheControl='max-age=31536000',
+            Metadata={SOURCE_ETAG_METADATA: source['ETag'].strip('"')}
+        )
+        
+        return {
+            'statusCode': 200,
+            'headers': get_cors_headers(),
+            'body': json.dumps({
+                'message': 'Thumbnail generated successfully',
+                'thumbnail_key': thumbnail_key
+            })
+        }
             
     except ClientError as e:
         logger.error(f"AWS Error: {str(e)}")
@@ -2,13 +2,13 @@ import json
 import os
 import uuid
 import logging
-import base64
+import binascii
 from urllib.parse import unquote_plus
 from typing import Dict, Any, Tuple
 
 from utils.s3_utils import (
-    validate_file_extension,
-    get_content_type,
+    get_file_extension,
+    get_extension_content_type,
     upload_file_to_s3
 )
 from utils.error_utils import (
@@ -23,14 +23,17 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Allowed file extensions
-ALLOWED_EXTENSIONS = {
+ALLOWED_EXTENSIONS = frozenset({
     # Images
     'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp',
     # Videos
     'mp4', 'avi', 'mov', 'wmv', 'flv', 'webm', 'mkv',
     # Audio
     'mp3', 'wav', 'flac', 'aac', 'ogg', 'm4a', 'wma'
-}
+})
+
+# Content types whose request body is the file itself rather than multipart form data
+RAW_BODY_CONTENT_TYPES = ('image/', 'video/', 'audio/', 'application/octet-stream')
 
 def get_cors_headers() -> Dict[str, str]:
     """Return CORS headers for API responses"""
@@ -40,12 +43,12 @@ def get_cors_headers() -> Dict[str, str]:
         'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
     }
 
-def generate_file_key(original_filename: str, upload_prefix: str) -> Tuple[str, str]:
+def generate_file_key(file_extension: str, upload_prefix: str) -> Tuple[str, str]:
     """
     Generate a unique file key with UUID
     
     Args:
-        original_filename (str): The original filename
+        file_extension (str): The original file's extension, without the dot
         upload_prefix (str): The S3 prefix for uploads
     
     Returns:
@@ -54,9 +57,6 @@ def generate_file_key(original_filename: str, upload_prefix: str) -> Tuple[str,
     # Generate unique file ID
     file_id = str(uuid.uuid4())
     
-    # Extract file extension
-    file_extension = original_filename.split('.')[-1] if '.' in original_filename else ''
-    
     # Create file key with UUID and original extension
     file_key = f"{upload_prefix}{file_id}.{file_extension}"
     
@@ -83,6 +83,85 @@ def create_success_response(file_key: str, file_id: str) -> Dict[str, Any]:
         })
     }
 
+def get_body_bytes(event: Dict[str, Any]) -> bytes:
+    """
+    Return the request body as bytes, base64-decoding only when API Gateway
+    flags the body as encoded
+    
+    Args:
+        event (dict): API Gateway event
+    
+    Returns:
+        bytes: Raw request body
+    """
+    body = event['body']
+    if not event.get('isBase64Encoded', True):
+        return body.encode() if isinstance(body, str) else body
+    
+    try:
+        logger.info("Decoding base64 body")
+        # a2b_base64 takes the ASCII str as-is; b64decode would first copy
+        # the whole payload into a bytes object
+        body = binascii.a2b_base64(body)
+        logger.info("Successfully decoded base64 body")
+        return body
+    except Exception as e:
+        logger.error(f"Failed to decode base64 body: {str(e)}")
+        raise BirdTagError(
+            message="Invalid request body format",
+            error_code=ErrorCode.INVALID_REQUEST,
+            status_code=400
+        )
+
+def get_upload_filename(event: Dict[str, Any]) -> str:
+    """
+    Get the upload filename from the query string
+    
+    Args:
+        event (dict): API Gateway event
+    
+    Returns:
+        str: Filename supplied by the client
+    """
+    query_params = event.get('queryStringParameters') or {}
+    logger.info(f"Query parameters: {query_params}")
+    
+    filename = query_params.get('filename')
+    if not filename:
+        logger.error("No filename provided in query parameters")
+        raise BirdTagError(
+            message="Filename is required",
+            error_code=ErrorCode.INVALID_REQUEST,
+            status_code=400
+        )
+    return filename
+
+def parse_upload_body(event: Dict[str, Any]) -> Tuple[bytes, str]:
+    """
+    Extract the uploaded file from the event. Bodies sent with a media or
+    application/octet-stream Content-Type are the file bytes themselves;
+    anything else is parsed as multipart form data
+    
+    Args:
+        event (dict): API Gateway event
+    
+    Returns:
+        tuple: (file_data, filename)
+    """
+    content_type = (event.get('headers') or {}).get('Content-Type', '')
+    if content_type.split(';')[0].strip().lower().startswith(RAW_BODY_CONTENT_TYPES):
+        if not event.get('body'):
+            raise BirdTagError(
+                message="No file data provided",
+                error_code=ErrorCode.INVALID_REQUEST,
+                status_code=400
+            )
+        file_data = get_body_bytes(event)
+        logger.info(f"Received raw file body, size: {len(file_data)} bytes")
+        return file_data, get_upload_filename(event)
+    
+    return parse_multipart_form_data(event)
+
 def parse_multipart_form_data(event: Dict[str, Any]) -> Tuple[bytes, str]:
     """
     Parse multipart form data from the event
@@ -117,34 +196,11 @@ def parse_multipart_form_data(event: Dict[str, Any]) -> Tuple[bytes, str]:
         )
     
     # Get raw body data
-    body = event['body']
-    logger.info(f"Body type: {type(body)}")
-    
-    # Decode base64 body
-    try:
-        logger.info("Decoding base64 body")
-        body = base64.b64decode(body)
-        logger.info("Successfully decoded base64 body")
-    except Exception as e:
-        logger.error(f"Failed to decode base64 body: {str(e)}")
-        raise BirdTagError(
-            message="Invalid request body format",
-            error_code=ErrorCode.INVALID_REQUEST,
-            status_code=400
-        )
+    logger.info(f"Body type: {type(event['body'])}")
+    body = get_body_bytes(event)
     
     # Get filename from query parameters
-    query_params = event.get('queryStringParameters', {})
-    logger.info(f"Query parameters: {query_params}")
-    
-    filename = query_params.get('filename')
-    if not filename:
-        logger.error("No filename provided in query parameters")
-        raise BirdTagError(
-            message="Filename is required",
-            error_code=ErrorCode.INVALID_REQUEST,
-            status_code=400
-        )
+    filename = get_upload_filename(event)
     
     # Extract file data from multipart form data
     try:
@@ -217,7 +273,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         dict: HTTP response with upload result or error
     """
     logger.info("Starting upload handler")
-    logger.info(f"Event: {json.dumps(event)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Event: %s", json.dumps(event, default=str))
     
     try:
         # Get environment variables
@@ -239,12 +296,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not upload_prefix.endswith('/'):
             upload_prefix += '/'
         
-        # Parse multipart form data
-        file_data, filename = parse_multipart_form_data(event)
+        # Parse raw or multipart upload body
+        file_data, filename = parse_upload_body(event)
         logger.info(f"File data size: {len(file_data)} bytes")
         
-        # Validate file extension
-        if not validate_file_extension(filename, ALLOWED_EXTENSIONS):
+        # Validate file extension, extracted once and reused below
+        file_extension = get_file_extension(filename)
+        if file_extension not in ALLOWED_EXTENSIONS:
             allowed_exts = ', '.join(sorted(ALLOWED_EXTENSIONS))
             logger.error(f"Invalid file extension: {filename}")
             raise BirdTagError(
@@ -254,7 +312,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             )
         
         # Generate unique file key and ID
-        file_key, file_id = generate_file_key(filename, upload_prefix)
+        file_key, file_id = generate_file_key(file_extension, upload_prefix)
         logger.info(f"Generated file key: {file_key}")
         logger.info(f"Generated file ID: {file_id}")
         
@@ -264,7 +322,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             bucket_name,
             file_key,
             file_data,
-            get_content_type(filename)
+            get_extension_content_type(file_extension)
         )
         logger.info("Successfully uploaded file to S3")
         
@@ -6,7 +6,7 @@ import time
 import logging
 import bcrypt
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from .error_utils import BirdTagError, ErrorCode
@@ -22,7 +22,7 @@ JWT_ALGORITHM = 'HS256'
 TOKEN_EXPIRY = 24 * 60 * 60  # 24 hours in seconds
 
 # Initialize CloudWatch client
-cloudwatch = boto3.client('cloudwatch')
+cloudwatch = boto3.client('cloudwatch', config=Config(tcp_keepalive=True))
 
 def log_auth_metric(metric_name: str, value: int = 1):
     """
@@ -39,7 +39,7 @@ def log_auth_metric(metric_name: str, value: int = 1):
                 'MetricName': metric_name,
                 'Value': value,
                 'Unit': 'Count',
-                'Timestamp': datetime.utcnow()
+                'Timestamp': time.time()
             }]
         )
     except Exception as e:
@@ -130,15 +130,15 @@ def generate_token(user_data: Dict[str, Any]) -> str:
             status_code=500
         )
     
-    # Set token expiry
-    expiry = datetime.utcnow() + timedelta(seconds=TOKEN_EXPIRY)
+    # Set token expiry; JWT NumericDate claims are plain epoch seconds
+    issued_at = int(time.time())
     
     # Create token payload
     payload = {
         'user_id': user_data['userId'],
         'email': user_data['email'],
-        'exp': expiry,
-        'iat': datetime.utcnow()
+        'exp': issued_at + TOKEN_EXPIRY,
+        'iat': issued_at
     }
     
     # Generate token
@@ -280,7 +280,7 @@ def register_user(email: str, password: str, name: Optional[str] = None) -> Dict
             'email': email,
             'password': hashed_password,
             'name': name,
-            'createdAt': datetime.utcnow().isoformat()
+            'createdAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
         }
         
         user = create_user(user_data)
@@ -0,0 +1,101 @@
+"""
+Rebuild the tag index from the media table.
+
+Records written before TAG_INDEX_TABLE was configured, or whose index
+update failed, are missing from the index until this runs. Every media
+record's rows are rewritten and rows with no matching tag are deleted.
+
+The index is scanned before the media table, and a row is only deleted
+after a consistent read of its record confirms the species is gone, so
+rows added by writes during the run are kept. Rows are rewritten from the
+scanned copy of each record, though, so a record retagged while the script
+runs can be left with its earlier rows; run it again once writes settle.
+
+Usage (from the project root):
+    DYNAMODB_TABLE=<media table> TAG_INDEX_TABLE=<index table> \\
+        python -m src.utils.backfill_tag_index
+"""
+from typing import Any, Dict, Iterator, Tuple
+
+from .dynamo_utils import DYNAMODB_TABLE, TAG_INDEX_TABLE, get_table, tag_attributes, tag_index_rows
+
+def scan_all(table: Any, **scan_params: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every item of a table scan, following pagination
+    
+    Args:
+        table (Table): DynamoDB table resource
+        **scan_params: Extra Table.scan arguments
+    
+    Yields:
+        Dict[str, Any]: Scanned items
+    """
+    while True:
+        response = table.scan(**scan_params)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def is_still_tagged(media: Any, key: Dict[str, Any]) -> bool:
+    """
+    Check with a consistent read whether a media record still has a species
+    
+    Args:
+        media (Table): Media table resource
+        key (dict): Tag index key with species and fileKey
+    
+    Returns:
+        bool: True if the record exists and is tagged with the species
+    """
+    item = media.get_item(
+        Key={'fileKey': key['fileKey']},
+        ProjectionExpression='tags',
+        ConsistentRead=True
+    ).get('Item')
+    return bool(item) and key['species'] in tag_attributes(item.get('tags'))['tagMap']
+
+def backfill_tag_index(media_table: str = DYNAMODB_TABLE, index_table: str = TAG_INDEX_TABLE) -> Tuple[int, int]:
+    """
+    Make the tag index match the media table
+    
+    Args:
+        media_table (str): Media table name
+        index_table (str): Tag index table name
+    
+    Returns:
+        Tuple[int, int]: (rows written, stale rows deleted)
+    """
+    if not index_table:
+        raise ValueError("TAG_INDEX_TABLE is not set")
+    
+    # Scan the index first: a row written after this scan is never a
+    # deletion candidate, even if the media scan below misses its record
+    index = get_table(index_table)
+    indexed = list(scan_all(index, ProjectionExpression='species, fileKey'))
+    
+    media = get_table(media_table)
+    rows = {}
+    for item in scan_all(
+        media,
+        ProjectionExpression='fileKey, fileUrl, thumbnailUrl, tags, #status',
+        ExpressionAttributeNames={'#status': 'status'}
+    ):
+        for row in tag_index_rows(item):
+            rows[(row['species'], row['fileKey'])] = row
+    
+    stale = [
+        key for key in indexed
+        if (key['species'], key['fileKey']) not in rows and not is_still_tagged(media, key)
+    ]
+    
+    with index.batch_writer() as batch:
+        for key in stale:
+            batch.delete_item(Key=key)
+        for row in rows.values():
+            batch.put_item(Item=row)
+    return len(rows), len(stale)
+
+if __name__ == '__main__':
+    written, deleted = backfill_tag_index()
+    print(f"{written} rows written, {deleted} stale rows deleted")
@@ -1,13 +1,16 @@
 import boto3
 import logging
 from boto3.dynamodb.conditions import Key, Attr
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Tuple
 from decimal import Decimal
-import json
+import heapq
 import time
 import uuid
+import zlib
 from datetime import datetime
 import os
+from functools import lru_cache
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from .error_utils import BirdTagError, ErrorCode
@@ -17,22 +20,33 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=Config(tcp_keepalive=True))
 
 # Environment variables with defaults
 DYNAMODB_TABLE = os.environ.get('DYNAMODB_TABLE', 'BirdTagMedia')
 USERS_TABLE = os.environ.get('USERS_TABLE', 'BirdTagUsers')
+# Optional table holding one row per (species, fileKey) so tag searches can
+# query by species instead of scanning the media table
+TAG_INDEX_TABLE = os.environ.get('TAG_INDEX_TABLE')
 
-class DecimalEncoder(json.JSONEncoder):
-    """Helper class to convert Decimal to float for JSON serialization"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+def decimal_default(obj: Any) -> float:
+    """
+    JSON `default` hook converting DynamoDB Decimals to float
+    
+    Args:
+        obj (Any): Value the encoder could not serialize
+    
+    Returns:
+        float: obj as a float
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
+@lru_cache(maxsize=None)
 def get_table(table_name: str) -> Any:
     """
-    Get DynamoDB table resource
+    Get DynamoDB table resource, built once per table name and container
     
     Args:
         table_name (str): Name of the DynamoDB table
@@ -42,6 +56,120 @@ def get_table(table_name: str) -> Any:
     """
     return dynamodb.Table(table_name)
 
+def parse_tag(tag: str) -> Optional[Tuple[str, int]]:
+    """
+    Split a "species,count" tag
+    
+    Args:
+        tag (str): Tag as stored on a media record
+    
+    Returns:
+        Optional[Tuple[str, int]]: (species, count), or None if the tag is not
+        in that form
+    """
+    species, sep, count = tag.partition(',')
+    if not sep:
+        return None
+    try:
+        return species.strip(), int(count)
+    except ValueError:
+        return None
+
+def species_bloom(species: Any) -> int:
+    """
+    Fold species names into a 64-bit fingerprint, one bit per name
+    
+    Args:
+        species (Iterable[str]): Species names
+    
+    Returns:
+        int: Bitmask with bit crc32(name) % 64 set for each name
+    """
+    bloom = 0
+    for name in species:
+        bloom |= 1 << (zlib.crc32(name.encode()) & 63)
+    return bloom
+
+def tag_attributes(tags: List[str]) -> Dict[str, Any]:
+    """
+    Build the pre-parsed tag attributes stored alongside a record's tags, so
+    searches can match on them without reparsing every tag string
+    
+    Args:
+        tags (List[str]): "species,count" tags
+    
+    Returns:
+        Dict[str, Any]: tagMap ({species: count}), speciesBloom (see
+        species_bloom) and, when there is at least one species, speciesSet
+        (DynamoDB rejects empty sets)
+    """
+    parsed = (parse_tag(tag) for tag in tags or [])
+    tag_map = dict(tag for tag in parsed if tag)
+    attributes = {'tagMap': tag_map, 'speciesBloom': species_bloom(tag_map)}
+    if tag_map:
+        attributes['speciesSet'] = set(tag_map)
+    return attributes
+
+def tag_index_rows(item: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build the tag index rows for a media record, one per tagged species
+    
+    Args:
+        item (dict): Media record
+    
+    Returns:
+        List[Dict[str, Any]]: Rows keyed by (species, fileKey), carrying the
+        species count and the fields searches return
+    """
+    rows = []
+    for species, count in tag_attributes(item.get('tags'))['tagMap'].items():
+        row = {
+            'species': species,
+            'fileKey': item['fileKey'],
+            'count': count,
+            'fileUrl': item.get('fileUrl', ''),
+            'tags': item['tags'],
+            'status': item.get('status')
+        }
+        if item.get('thumbnailUrl'):
+            row['thumbnailUrl'] = item['thumbnailUrl']
+        rows.append(row)
+    return rows
+
+def sync_tag_index(old_item: Optional[Dict[str, Any]], new_item: Optional[Dict[str, Any]]) -> None:
+    """
+    Bring a media record's tag index rows in line with its current tags,
+    deleting rows for species it no longer has. Does nothing unless
+    TAG_INDEX_TABLE is configured. The media write has already succeeded
+    when this runs, so a failure is logged rather than raised; the
+    backfill_tag_index script repairs the index
+    
+    Args:
+        old_item (dict, optional): Record as it was before the write
+        new_item (dict, optional): Record as written, None if deleted
+    """
+    if not TAG_INDEX_TABLE:
+        return
+    
+    new_rows = tag_index_rows(new_item) if new_item else []
+    old_species = tag_attributes(old_item.get('tags'))['tagMap'] if old_item else {}
+    stale = old_species.keys() - {row['species'] for row in new_rows}
+    if not new_rows and not stale:
+        return
+    
+    file_key = (new_item or old_item)['fileKey']
+    try:
+        with get_table(TAG_INDEX_TABLE).batch_writer() as batch:
+            for species in stale:
+                batch.delete_item(Key={'species': species, 'fileKey': file_key})
+            for row in new_rows:
+                batch.put_item(Item=row)
+    except Exception as e:
+        logger.error(
+            f"Tag index out of date for {file_key}: {str(e)}; "
+            "run python -m src.utils.backfill_tag_index to repair it"
+        )
+
 def create_media_record(
     table_name: str,
     file_key: str,
@@ -76,7 +204,8 @@ def create_media_record(
             'tags': tags,
             'fileUrl': file_url,
             'status': 'completed',
-            'timestamp': int(time.time())
+            'timestamp': int(time.time()),
+            **tag_attributes(tags)
         }
         
         if thumbnail_url:
@@ -86,7 +215,8 @@ def create_media_record(
             item.update(metadata)
         
         # Put item in table
-        table.put_item(Item=item)
+        response = table.put_item(Item=item, ReturnValues='ALL_OLD')
+        sync_tag_index(response.get('Attributes'), item)
         
         return item
     
@@ -118,6 +248,13 @@ def update_media_record(
     try:
         table = get_table(table_name)
         
+        # Index rows copy these fields, so they need the record's old tags
+        reindex = TAG_INDEX_TABLE and updates.keys() & {'tags', 'fileUrl', 'thumbnailUrl', 'status'}
+        old_item = get_media_record(table_name, file_key) if reindex else None
+        
+        if 'tags' in updates:
+            updates = {**updates, **tag_attributes(updates['tags'])}
+        
         # Build update expression
         update_expr = "SET "
         expr_attr_values = {}
@@ -139,7 +276,10 @@ def update_media_record(
             ReturnValues="ALL_NEW"
         )
         
-        return response.get('Attributes', {})
+        new_item = response.get('Attributes', {})
+        if reindex:
+            sync_tag_index(old_item, new_item)
+        return new_item
     
     except Exception as e:
         logger.error(f"Error updating media record: {str(e)}")
@@ -299,7 +439,8 @@ def delete_media_record(table_name: str, file_key: str) -> None:
     """
     try:
         table = get_table(table_name)
-        table.delete_item(Key={'fileKey': file_key})
+        response = table.delete_item(Key={'fileKey': file_key}, ReturnValues='ALL_OLD')
+        sync_tag_index(response.get('Attributes'), None)
     except Exception as e:
         logger.error(f"Error deleting media record: {str(e)}")
         raise BirdTagError(
@@ -347,7 +488,7 @@ def get_user_stats(user_id: str) -> Dict[str, Any]:
             'userId': user_id,
             'totalMedia': total_media,
             'mediaByType': media_by_type,
-            'topTags': sorted(tags_count.items(), key=lambda x: x[1], reverse=True)[:10]
+            'topTags': heapq.nlargest(10, tags_count.items(), key=lambda x: x[1])
         }
     
     except Exception as e:
@@ -393,8 +534,8 @@ def get_system_stats() -> Dict[str, Any]:
         return {
             'totalMedia': total_media,
             'mediaByType': media_by_type,
-            'topTags': sorted(tags_count.items(), key=lambda x: x[1], reverse=True)[:20],
-            'topSpecies': sorted(species_count.items(), key=lambda x: x[1], reverse=True)[:20]
+            'topTags': heapq.nlargest(20, tags_count.items(), key=lambda x: x[1]),
+            'topSpecies': heapq.nlargest(20, species_count.items(), key=lambda x: x[1])
         }
     
     except Exception as e:
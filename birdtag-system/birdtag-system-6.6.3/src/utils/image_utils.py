@@ -129,7 +129,9 @@ def convert_to_jpg(input_path: str, output_path: str, quality: int = 95) -> str:
             background = Image.new('RGB', image.size, (255, 255, 255))
             background.paste(image, mask=image.split()[-1])
             image = background
-        image.convert('RGB').save(output_path, 'JPEG', quality=quality)
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.save(output_path, 'JPEG', quality=quality)
         return output_path
     except BirdTagError as e:
         raise e
@@ -256,7 +258,9 @@ def create_thumbnail(
             )
             
         with Image.open(image_path) as img:
-            img.thumbnail(size)
+            # Let libjpeg decode JPEGs at a reduced scale that still covers size
+            img.draft(img.mode, size)
+            img.thumbnail(size, Image.Resampling.LANCZOS)
             img.save(output_path)
         return output_path
     except BirdTagError as e:
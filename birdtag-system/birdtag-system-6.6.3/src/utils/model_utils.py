@@ -3,7 +3,6 @@ import time
 import logging
 import json
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 
 from utils.error_utils import BirdTagError, ErrorCode
 from utils.dynamo_utils import create_model_metric, get_model_metrics
@@ -46,7 +45,7 @@ class ModelMetrics:
         self.start_time = time.time()
         self.metrics = {
             'modelName': model_name,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
             'processingTime': 0,
             'inputSize': 0,
             'outputSize': 0,
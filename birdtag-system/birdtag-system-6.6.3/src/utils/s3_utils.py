@@ -1,6 +1,10 @@
 import boto3
+from botocore.config import Config
 import os
+import time
 import logging
+from collections import OrderedDict
+from functools import lru_cache
 from botocore.exceptions import ClientError, ParamValidationError
 from typing import Dict, Optional, Tuple, List
 from .error_utils import BirdTagError, ErrorCode
@@ -10,7 +14,12 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize S3 client
-s3_client = boto3.client('s3')
+s3_client = boto3.client('s3', config=Config(tcp_keepalive=True))
+
+# Download URLs signed by this container, reused for the first half of their
+# lifetime so repeated requests for the same object skip re-signing
+DOWNLOAD_URL_CACHE_SIZE = 1024
+_download_urls: "OrderedDict[Tuple[str, str, int], Tuple[str, float]]" = OrderedDict()
 
 # Allowed file extensions and their content types
 ALLOWED_EXTENSIONS = {
@@ -95,9 +104,33 @@ def validate_file_extension(filename: str) -> bool:
     if not filename:
         return False
     
-    # Extract file extension
-    file_extension = filename.lower().split('.')[-1] if '.' in filename else ''
-    return file_extension in ALLOWED_EXTENSIONS
+    return get_file_extension(filename) in ALLOWED_EXTENSIONS
+
+def get_file_extension(filename: str) -> str:
+    """
+    Get the lowercased extension of a filename
+    
+    Args:
+        filename (str): The filename
+    
+    Returns:
+        str: Extension without the dot, or '' if there is none
+    """
+    _, dot, extension = filename.rpartition('.')
+    return extension.lower() if dot else ''
+
+@lru_cache(maxsize=256)
+def get_extension_content_type(extension: str) -> str:
+    """
+    Get content type for an already extracted, lowercased extension
+    
+    Args:
+        extension (str): Extension without the dot
+    
+    Returns:
+        str: MIME type
+    """
+    return ALLOWED_EXTENSIONS.get(extension, 'application/octet-stream')
 
 def get_content_type(filename: str) -> str:
     """
@@ -109,8 +142,7 @@ def get_content_type(filename: str) -> str:
     Returns:
         str: MIME type
     """
-    extension = filename.lower().split('.')[-1] if '.' in filename else ''
-    return ALLOWED_EXTENSIONS.get(extension, 'application/octet-stream')
+    return get_extension_content_type(get_file_extension(filename))
 
 def generate_presigned_url(
     bucket_name: str,
@@ -172,6 +204,22 @@ def download_file(bucket_name: str, file_key: str, local_path: str) -> None:
     except Exception as e:
         handle_s3_error(e, "download file")
 
+def read_object(bucket_name: str, file_key: str) -> bytes:
+    """
+    Read an S3 object's content into memory
+    
+    Args:
+        bucket_name (str): S3 bucket name
+        file_key (str): S3 object key
+        
+    Returns:
+        bytes: Object content
+    """
+    try:
+        return s3_client.get_object(Bucket=bucket_name, Key=file_key)['Body'].read()
+    except Exception as e:
+        handle_s3_error(e, "read object")
+
 def upload_file(local_path: str, bucket_name: str, file_key: str, metadata: Optional[Dict] = None) -> None:
     """
     Upload a file to S3
@@ -256,7 +304,8 @@ def get_object_metadata(bucket_name: str, file_key: str) -> Dict:
 
 def generate_download_url(bucket_name: str, file_key: str, expires_in: int = 3600) -> str:
     """
-    Generate a presigned URL for downloading a file
+    Generate a presigned URL for downloading a file, reusing one signed
+    earlier in this container while at least half its lifetime remains
     
     Args:
         bucket_name (str): S3 bucket name
@@ -266,8 +315,15 @@ def generate_download_url(bucket_name: str, file_key: str, expires_in: int = 360
     Returns:
         str: Presigned URL for download
     """
+    cache_key = (bucket_name, file_key, expires_in)
+    now = time.time()
+    cached = _download_urls.get(cache_key)
+    if cached and now - cached[1] < expires_in / 2:
+        _download_urls.move_to_end(cache_key)
+        return cached[0]
+    
     try:
-        return s3_client.generate_presigned_url(
+        url = s3_client.generate_presigned_url(
             'get_object',
             Params={
                 'Bucket': bucket_name,
@@ -277,6 +333,11 @@ def generate_download_url(bucket_name: str, file_key: str, expires_in: int = 360
         )
     except Exception as e:
         handle_s3_error(e, "generate download URL")
+    
+    _download_urls[cache_key] = (url, now)
+    if len(_download_urls) > DOWNLOAD_URL_CACHE_SIZE:
+        _download_urls.popitem(last=False)
+    return url
 
 def upload_file_to_s3(bucket_name: str, file_key: str, file_data: bytes, content_type: str) -> None:
     """
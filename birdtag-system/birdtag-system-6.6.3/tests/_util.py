@@ -0,0 +1,5 @@
+"""Shared helpers for the test suite."""
+try:
+    from orjson import loads as jloads
+except ImportError:
+    from json import loads as jloads
@@ -1,9 +1,10 @@
 import os
 import sys
+import json
 import pytest
 import boto3
+import moto
 from unittest.mock import patch, MagicMock
-from moto import mock_dynamodb, mock_s3
 
 # 设置环境变量
 os.environ['PYTHONPATH'] = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -37,6 +38,18 @@ os.makedirs(matplotlib_test_data_dir, exist_ok=True)
 baseline_dir = os.path.join(matplotlib_test_data_dir, 'baseline')
 os.makedirs(baseline_dir, exist_ok=True)
 
+# moto mocks run for the whole session rather than being entered per fixture;
+# reset_moto_state wipes their backends after every test
+_moto_mocks = [moto.mock_s3(), moto.mock_dynamodb(), moto.mock_sns()]
+
+def pytest_sessionstart(session):
+    for mock in _moto_mocks:
+        mock.start()
+
+def pytest_sessionfinish(session, exitstatus):
+    for mock in reversed(_moto_mocks):
+        mock.stop()
+
 def pytest_configure(config):
     """Configure pytest based on Python version"""
     python_version = sys.version_info
@@ -50,6 +63,13 @@ def pytest_configure(config):
     # 设置环境变量
     os.environ["PYTHON_VERSION"] = f"{python_version.major}.{python_version.minor}"
 
+@pytest.fixture(autouse=True)
+def reset_moto_state():
+    """Drop the buckets, tables and topics a test created so the next one starts empty"""
+    yield
+    for mock in _moto_mocks:
+        mock.reset()
+
 # Mock AWS services
 @pytest.fixture(autouse=True)
 def mock_aws_services():
@@ -120,13 +140,11 @@ def aws_credentials():
 
 @pytest.fixture(scope="function")
 def dynamodb(aws_credentials):
-    with mock_dynamodb():
-        yield boto3.resource("dynamodb")
+    return boto3.resource("dynamodb")
 
 @pytest.fixture(scope="function")
 def s3(aws_credentials):
-    with mock_s3():
-        yield boto3.client("s3")
+    return boto3.client("s3")
 
 @pytest.fixture(scope="function")
 def cognito(aws_credentials):
@@ -148,6 +166,32 @@ def cognito(aws_credentials):
         mock_cognito.confirm_sign_up.return_value = {}
         yield mock_cognito
 
+@pytest.fixture(scope="session")
+def session_cache():
+    """Values computed once and shared by every test in the session"""
+    return {}
+
+@pytest.fixture(scope="function")
+def bearer_token(cognito, session_cache):
+    """Authorization header for the workflow test user, logged in once per session"""
+    if 'bearer_token' not in session_cache:
+        from src.handlers.auth_handler import lambda_handler as auth_handler
+        from _util import jloads
+
+        login_event = {
+            "httpMethod": "POST",
+            "body": json.dumps({
+                "email": "test@example.com",
+                "password": "Test123!"
+            })
+        }
+        login_response = auth_handler(login_event, {})
+        assert login_response["statusCode"] == 200
+        login_body = jloads(login_response["body"])
+        assert "accessToken" in login_body
+        session_cache['bearer_token'] = f"Bearer {login_body['accessToken']}"
+    return session_cache['bearer_token']
+
 @pytest.fixture(scope="function")
 def local_mode():
     """Enable local mode for testing"""
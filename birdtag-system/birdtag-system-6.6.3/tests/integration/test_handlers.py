@@ -3,6 +3,7 @@ import json
 from src.handlers.upload_handler import lambda_handler as upload_handler
 from src.handlers.search_handler import lambda_handler as search_handler
 from src.handlers.tag_handler import lambda_handler as tag_handler
+from _util import jloads
 
 def test_upload_handler(s3, dynamodb):
     # Test upload handler
@@ -15,7 +16,7 @@ def test_upload_handler(s3, dynamodb):
     }
     response = upload_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "uploadUrl" in body
     assert "fileKey" in body
 
@@ -32,7 +33,7 @@ def test_search_handler(dynamodb):
     }
     response = search_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "results" in body
 
 def test_tag_handler(dynamodb):
@@ -46,5 +47,5 @@ def test_tag_handler(dynamodb):
     }
     response = tag_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "message" in body 
\ No newline at end of file
@@ -1,7 +1,6 @@
 import pytest
 import json
 import os
-from moto import mock_sns, mock_dynamodb
 import boto3
 from src.handlers.sns_handler import lambda_handler
 
@@ -10,10 +9,9 @@ os.environ["SNS_TOPIC"] = SNS_TOPIC
 
 @pytest.fixture
 def sns():
-    with mock_sns():
-        sns = boto3.client("sns", region_name="us-east-1")
-        sns.create_topic(Name="TestTopic")
-        yield sns
+    sns = boto3.client("sns", region_name="us-east-1")
+    sns.create_topic(Name="TestTopic")
+    return sns
 
 def test_subscribe_and_unsubscribe(sns):
     # Subscribe
@@ -1,7 +1,6 @@
 import pytest
 import os
 import tempfile
-from moto import mock_s3, mock_dynamodb
 import boto3
 from PIL import Image
 from src.handlers.thumbnail_handler import lambda_handler
@@ -13,29 +12,27 @@ os.environ["DYNAMODB_TABLE"] = DYNAMODB_TABLE
 
 @pytest.fixture
 def s3():
-    with mock_s3():
-        s3 = boto3.client("s3", region_name="us-east-1")
-        s3.create_bucket(Bucket=MEDIA_BUCKET)
-        yield s3
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket=MEDIA_BUCKET)
+    return s3
 
 @pytest.fixture
 def dynamodb():
-    with mock_dynamodb():
-        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-        table = dynamodb.create_table(
-            TableName=DYNAMODB_TABLE,
-            KeySchema=[{"AttributeName": "fileKey", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "fileKey", "AttributeType": "S"}],
-            BillingMode="PAY_PER_REQUEST"
-        )
-        table.put_item(Item={"fileKey": "uploads/test.jpg"})
-        yield table
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    table = dynamodb.create_table(
+        TableName=DYNAMODB_TABLE,
+        KeySchema=[{"AttributeName": "fileKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "fileKey", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    table.put_item(Item={"fileKey": "uploads/test.jpg"})
+    return table
 
 def test_thumbnail_lambda_creates_thumbnail(s3, dynamodb):
     # Create and upload a test image
     with tempfile.NamedTemporaryFile(suffix=".jpg") as tmp:
-        img = Image.new("RGB", (800, 600), color="blue")
-        img.save(tmp.name, "JPEG")
+        img = Image.new("RGB", (32, 32), color="blue")
+        img.save(tmp.name, "JPEG", quality=10, optimize=False)
         s3.upload_file(tmp.name, MEDIA_BUCKET, "uploads/test.jpg")
 
     # Simulate S3 event
@@ -1,14 +1,18 @@
 import pytest
 import json
 import time
-from src.handlers.auth_handler import lambda_handler as auth_handler
-from src.handlers.upload_handler import lambda_handler as upload_handler
-from src.handlers.media_processor_handler import lambda_handler as media_handler
-from src.handlers.bird_detection_lambda import lambda_handler as detection_handler
-from src.handlers.birdnet_analyzer_lambda import lambda_handler as analyzer_handler
-from src.handlers.search_handler import lambda_handler as search_handler
+from _util import jloads
+
+# Handler modules are imported inside each test so collection only pays for
+# the handlers (and their heavy transitive imports) a test actually uses.
+
+def test_complete_workflow(s3, dynamodb, cognito, bearer_token):
+    from src.handlers.auth_handler import lambda_handler as auth_handler
+    from src.handlers.upload_handler import lambda_handler as upload_handler
+    from src.handlers.media_processor_handler import lambda_handler as media_handler
+    from src.handlers.bird_detection_lambda import lambda_handler as detection_handler
+    from src.handlers.search_handler import lambda_handler as search_handler
 
-def test_complete_workflow(s3, dynamodb, cognito):
     # 1. Register user
     register_event = {
         "httpMethod": "POST",
@@ -21,24 +25,10 @@ def test_complete_workflow(s3, dynamodb, cognito):
     }
     register_response = auth_handler(register_event, {})
     assert register_response["statusCode"] == 200
-    register_body = json.loads(register_response["body"])
+    register_body = jloads(register_response["body"])
     assert "userId" in register_body
 
-    # 2. Login user
-    login_event = {
-        "httpMethod": "POST",
-        "body": json.dumps({
-            "email": "test@example.com",
-            "password": "Test123!"
-        })
-    }
-    login_response = auth_handler(login_event, {})
-    assert login_response["statusCode"] == 200
-    login_body = json.loads(login_response["body"])
-    assert "accessToken" in login_body
-    token = login_body["accessToken"]
-
-    # 3. Get upload URL
+    # 2. Get upload URL (login is shared through the bearer_token fixture)
     upload_event = {
         "httpMethod": "GET",
         "queryStringParameters": {
@@ -46,47 +36,47 @@ def test_complete_workflow(s3, dynamodb, cognito):
             "fileName": "test.jpg"
         },
         "headers": {
-            "Authorization": f"Bearer {token}"
+            "Authorization": bearer_token
         }
     }
     upload_response = upload_handler(upload_event, {})
     assert upload_response["statusCode"] == 200
-    upload_body = json.loads(upload_response["body"])
+    upload_body = jloads(upload_response["body"])
     assert "uploadUrl" in upload_body
     assert "fileKey" in upload_body
     file_key = upload_body["fileKey"]
 
-    # 4. Process media
+    # 3. Process media
     media_event = {
         "httpMethod": "POST",
         "body": json.dumps({
             "fileKey": file_key
         }),
         "headers": {
-            "Authorization": f"Bearer {token}"
+            "Authorization": bearer_token
         }
     }
     media_response = media_handler(media_event, {})
     assert media_response["statusCode"] == 200
-    media_body = json.loads(media_response["body"])
+    media_body = jloads(media_response["body"])
     assert "thumbnailUrl" in media_body
 
-    # 5. Run bird detection
+    # 4. Run bird detection
     detection_event = {
         "httpMethod": "POST",
         "body": json.dumps({
             "fileKey": file_key
         }),
         "headers": {
-            "Authorization": f"Bearer {token}"
+            "Authorization": bearer_token
         }
     }
     detection_response = detection_handler(detection_event, {})
     assert detection_response["statusCode"] == 200
-    detection_body = json.loads(detection_response["body"])
+    detection_body = jloads(detection_response["body"])
     assert "detections" in detection_body
 
-    # 6. Search for media
+    # 5. Search for media
     search_event = {
         "httpMethod": "POST",
         "body": json.dumps({
@@ -96,29 +86,20 @@ def test_complete_workflow(s3, dynamodb, cognito):
             "endDate": "2024-12-31"
         }),
         "headers": {
-            "Authorization": f"Bearer {token}"
+            "Authorization": bearer_token
         }
     }
     search_response = search_handler(search_event, {})
     assert search_response["statusCode"] == 200
-    search_body = json.loads(search_response["body"])
+    search_body = jloads(search_response["body"])
     assert "results" in search_body
 
-def test_audio_workflow(s3, dynamodb, cognito):
-    # 1. Login user
-    login_event = {
-        "httpMethod": "POST",
-        "body": json.dumps({
-            "email": "test@example.com",
-            "password": "Test123!"
-        })
-    }
-    login_response = auth_handler(login_event, {})
-    assert login_response["statusCode"] == 200
-    login_body = json.loads(login_response["body"])
-    token = login_body["accessToken"]
+def test_audio_workflow(s3, dynamodb, cognito, bearer_token):
+    from src.handlers.upload_handler import lambda_handler as upload_handler
+    from src.handlers.media_processor_handler import lambda_handler as media_handler
+    from src.handlers.birdnet_analyzer_lambda import lambda_handler as analyzer_handler
 
-    # 2. Get upload URL for audio
+    # 1. Get upload URL for audio (login is shared through the bearer_token fixture)
     upload_event = {
         "httpMethod": "GET",
         "queryStringParameters": {
@@ -126,45 +107,47 @@ def test_audio_workflow(s3, dynamodb, cognito):
             "fileName": "test.wav"
         },
         "headers": {
-            "Authorization": f"Bearer {token}"
+            "Authorization": bearer_token
         }
     }
     upload_response = upload_handler(upload_event, {})
     assert upload_response["statusCode"] == 200
-    upload_body = json.loads(upload_response["body"])
+    upload_body = jloads(upload_response["body"])
     file_key = upload_body["fileKey"]
 
-    # 3. Process audio
+    # 2. Process audio
     media_event = {
         "httpMethod": "POST",
         "body": json.dumps({
             "fileKey": file_key
         }),
         "headers": {
-            "Authorization": f"Bearer {token}"
+            "Authorization": bearer_token
         }
     }
     media_response = media_handler(media_event, {})
     assert media_response["statusCode"] == 200
-    media_body = json.loads(media_response["body"])
+    media_body = jloads(media_response["body"])
     assert "waveformUrl" in media_body
 
-    # 4. Run bird sound analysis
+    # 3. Run bird sound analysis
     analysis_event = {
         "httpMethod": "POST",
         "body": json.dumps({
             "fileKey": file_key
         }),
         "headers": {
-            "Authorization": f"Bearer {token}"
+            "Authorization": bearer_token
         }
     }
     analysis_response = analyzer_handler(analysis_event, {})
     assert analysis_response["statusCode"] == 200
-    analysis_body = json.loads(analysis_response["body"])
+    analysis_body = jloads(analysis_response["body"])
     assert "detections" in analysis_body
 
 def test_error_handling(s3, dynamodb, cognito):
+    from src.handlers.upload_handler import lambda_handler as upload_handler
+
     # Test unauthorized access
     event = {
         "httpMethod": "GET",
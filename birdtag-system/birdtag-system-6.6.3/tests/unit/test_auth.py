@@ -3,6 +3,7 @@ import json
 import os
 from src.handlers.auth_handler import lambda_handler, handle_login, handle_register, handle_verify
 from src.utils.error_utils import BirdTagError, ErrorCode
+from _util import jloads
 
 @pytest.fixture
 def register_event():
@@ -54,7 +55,7 @@ def test_register_user_success(register_event, local_mode):
     """Test successful user registration"""
     response = handle_register(register_event, None)
     assert response['statusCode'] == 200
-    body = json.loads(response['body'])
+    body = jloads(response['body'])
     assert 'message' in body
     assert 'success' in body['message'].lower()
 
@@ -67,7 +68,7 @@ def test_register_user_invalid_email(register_event, local_mode):
     })
     response = handle_register(register_event, None)
     assert response['statusCode'] == 400
-    body = json.loads(response['body'])
+    body = jloads(response['body'])
     assert 'error' in body
 
 def test_register_user_short_password(register_event, local_mode):
@@ -79,14 +80,14 @@ def test_register_user_short_password(register_event, local_mode):
     })
     response = handle_register(register_event, None)
     assert response['statusCode'] == 400
-    body = json.loads(response['body'])
+    body = jloads(response['body'])
     assert 'error' in body
 
 def test_login_user_success(login_event, local_mode):
     """Test successful user login"""
     response = handle_login(login_event, None)
     assert response['statusCode'] == 200
-    body = json.loads(response['body'])
+    body = jloads(response['body'])
     assert 'tokens' in body
     assert 'accessToken' in body['tokens']
 
@@ -98,14 +99,14 @@ def test_login_user_invalid_credentials(login_event, local_mode):
     })
     response = handle_login(login_event, None)
     assert response['statusCode'] == 401
-    body = json.loads(response['body'])
+    body = jloads(response['body'])
     assert 'error' in body
 
 def test_verify_email_success(verify_event, local_mode):
     """Test successful email verification"""
     response = handle_verify(verify_event, None)
     assert response['statusCode'] == 200
-    body = json.loads(response['body'])
+    body = jloads(response['body'])
     assert 'message' in body
     assert 'success' in body['message'].lower()
 
@@ -117,7 +118,7 @@ def test_verify_email_invalid_code(verify_event, local_mode):
     })
     response = handle_verify(verify_event, None)
     assert response['statusCode'] == 400
-    body = json.loads(response['body'])
+    body = jloads(response['body'])
     assert 'error' in body
 
 def test_missing_required_fields(register_event, local_mode):
@@ -128,7 +129,7 @@ def test_missing_required_fields(register_event, local_mode):
     })
     response = handle_register(register_event, None)
     assert response['statusCode'] == 400
-    body = json.loads(response['body'])
+    body = jloads(response['body'])
     assert 'error' in body
     assert 'required' in body['error'].lower()
 
@@ -137,7 +138,7 @@ def test_invalid_content_type(register_event, local_mode):
     register_event['headers']['Content-Type'] = 'text/plain'
     response = lambda_handler(register_event, None)
     assert response['statusCode'] == 400
-    body = json.loads(response['body'])
+    body = jloads(response['body'])
     assert 'error' in body
     assert 'content-type' in body['error']['message'].lower()
 
@@ -4,10 +4,10 @@ import os
 import tempfile
 from PIL import Image
 import numpy as np
-from moto import mock_s3, mock_dynamodb
 import boto3
 from src.handlers.bird_detection_lambda import lambda_handler
 from src.utils.error_utils import BirdTagError, ErrorCode
+from _util import jloads
 
 # Test configuration
 TEST_BUCKET = "test-bucket"
@@ -43,45 +43,42 @@ def aws_credentials():
 @pytest.fixture
 def s3(aws_credentials):
     """Create mock S3 bucket."""
-    with mock_s3():
-        s3 = boto3.client("s3", region_name=TEST_REGION)
-        # Create test buckets
-        s3.create_bucket(Bucket=TEST_BUCKET)
-        s3.create_bucket(Bucket=MODEL_BUCKET)
-        s3.create_bucket(Bucket=MEDIA_BUCKET)
-        
-        # Upload mock model file
-        with tempfile.NamedTemporaryFile() as tmp:
-            tmp.write(b"mock model data")
-            tmp.flush()
-            s3.upload_file(tmp.name, MODEL_BUCKET, MODEL_KEY)
-        
-        yield s3
+    s3 = boto3.client("s3", region_name=TEST_REGION)
+    # Create test buckets
+    s3.create_bucket(Bucket=TEST_BUCKET)
+    s3.create_bucket(Bucket=MODEL_BUCKET)
+    s3.create_bucket(Bucket=MEDIA_BUCKET)
+    
+    # Upload mock model file
+    with tempfile.NamedTemporaryFile() as tmp:
+        tmp.write(b"mock model data")
+        tmp.flush()
+        s3.upload_file(tmp.name, MODEL_BUCKET, MODEL_KEY)
+    
+    return s3
 
 @pytest.fixture
 def dynamodb(aws_credentials):
     """Create mock DynamoDB table."""
-    with mock_dynamodb():
-        dynamodb = boto3.resource("dynamodb", region_name=TEST_REGION)
-        table = dynamodb.create_table(
-            TableName=DYNAMODB_TABLE,
-            KeySchema=[{"AttributeName": "fileKey", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "fileKey", "AttributeType": "S"}],
-            ProvisionedThroughput={"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
-        )
-        yield table
+    dynamodb = boto3.resource("dynamodb", region_name=TEST_REGION)
+    return dynamodb.create_table(
+        TableName=DYNAMODB_TABLE,
+        KeySchema=[{"AttributeName": "fileKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "fileKey", "AttributeType": "S"}],
+        ProvisionedThroughput={"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
+    )
 
-def create_test_image(width=800, height=600):
-    """Create a test image file."""
-    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-        img = Image.new("RGB", (width, height), color="red")
-        img.save(tmp.name, "JPEG")
-        return tmp.name
+def create_test_image(tmp_path, width=32, height=32):
+    """Create a small, low-quality test image file under pytest's tmp_path."""
+    path = tmp_path / "test.jpg"
+    img = Image.new("RGB", (width, height), color="red")
+    img.save(path, "JPEG", quality=10, optimize=False)
+    return str(path)
 
-def test_bird_detection(s3, dynamodb):
+def test_bird_detection(s3, dynamodb, tmp_path):
     """Test bird detection functionality."""
     # Create and upload test image
-    test_image = create_test_image()
+    test_image = create_test_image(tmp_path)
     s3.upload_file(test_image, MEDIA_BUCKET, "test.jpg")
     
     # Test detection
@@ -94,18 +91,15 @@ def test_bird_detection(s3, dynamodb):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "detections" in body
     assert "species" in body
     assert "confidence" in body
-    
-    # Cleanup
-    os.unlink(test_image)
 
-def test_detection_cache(s3, dynamodb):
+def test_detection_cache(s3, dynamodb, tmp_path):
     """Test detection caching functionality."""
     # Create and upload test image
-    test_image = create_test_image()
+    test_image = create_test_image(tmp_path)
     s3.upload_file(test_image, MEDIA_BUCKET, "test.jpg")
     
     # First request
@@ -123,9 +117,8 @@ def test_detection_cache(s3, dynamodb):
     response2 = lambda_handler(event, {})
     assert response2["statusCode"] == 200
     assert response1["body"] == response2["body"]
-    
-    # Cleanup
-    os.unlink(test_image)
+    # The cached body is served from the response pool, not re-serialized
+    assert response1["body"] is response2["body"]
 
 def test_invalid_image(s3, dynamodb):
     """Test handling of invalid images."""
@@ -138,7 +131,7 @@ def test_invalid_image(s3, dynamodb):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 400
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
     assert "invalid image" in body["error"]["message"].lower()
 
@@ -153,16 +146,16 @@ def test_missing_file(s3, dynamodb):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 404
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
     assert "file not found" in body["error"]["message"].lower()
 
-def test_model_error(s3, dynamodb):
+def test_model_error(s3, dynamodb, tmp_path):
     """Test model error handling."""
     # Create a corrupted image
-    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-        tmp.write(b"corrupted image data")
-        corrupted_image = tmp.name
+    corrupted_path = tmp_path / "corrupted.jpg"
+    corrupted_path.write_bytes(b"corrupted image data")
+    corrupted_image = str(corrupted_path)
     
     s3.upload_file(corrupted_image, MEDIA_BUCKET, "corrupted.jpg")
     
@@ -175,9 +168,6 @@ def test_model_error(s3, dynamodb):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 500
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
     assert "model error" in body["error"]["message"].lower()
-    
-    # Cleanup
-    os.unlink(corrupted_image) 
\ No newline at end of file
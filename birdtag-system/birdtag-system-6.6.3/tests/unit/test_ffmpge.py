@@ -1,11 +1,10 @@
 import pytest
 import json
 import os
-import tempfile
-from moto import mock_s3
 import boto3
 from src.handlers.ffmpeg_handler import lambda_handler
 from src.utils.error_utils import BirdTagError, ErrorCode
+from _util import jloads
 
 # Test configuration
 TEST_BUCKET = "test-bucket"
@@ -23,27 +22,26 @@ def aws_credentials():
 @pytest.fixture
 def s3(aws_credentials):
     """Create mock S3 bucket."""
-    with mock_s3():
-        s3 = boto3.client("s3", region_name=TEST_REGION)
-        s3.create_bucket(Bucket=TEST_BUCKET)
-        yield s3
+    s3 = boto3.client("s3", region_name=TEST_REGION)
+    s3.create_bucket(Bucket=TEST_BUCKET)
+    return s3
 
-def create_test_video():
-    """Create a test video file."""
-    with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
-        tmp.write(b"fake video content")
-        return tmp.name
+def create_test_video(tmp_path):
+    """Create a test video file under pytest's tmp_path."""
+    path = tmp_path / "test.mp4"
+    path.write_bytes(b"fake video content")
+    return str(path)
 
-def create_test_audio():
-    """Create a test audio file."""
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp.write(b"fake audio content")
-        return tmp.name
+def create_test_audio(tmp_path):
+    """Create a test audio file under pytest's tmp_path."""
+    path = tmp_path / "test.wav"
+    path.write_bytes(b"fake audio content")
+    return str(path)
 
-def test_video_thumbnail(s3):
+def test_video_thumbnail(s3, tmp_path):
     """Test video thumbnail generation."""
     # Create and upload test video
-    test_video = create_test_video()
+    test_video = create_test_video(tmp_path)
     s3.upload_file(test_video, TEST_BUCKET, "test.mp4")
     
     # Test thumbnail generation
@@ -56,7 +54,7 @@ def test_video_thumbnail(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "thumbnailUrl" in body
     assert "thumbnailKey" in body
     
@@ -64,14 +62,11 @@ def test_video_thumbnail(s3):
     thumbnail_key = body["thumbnailKey"]
     response = s3.head_object(Bucket=TEST_BUCKET, Key=thumbnail_key)
     assert response["ContentType"] == "image/jpeg"
-    
-    # Cleanup
-    os.unlink(test_video)
 
-def test_audio_waveform(s3):
+def test_audio_waveform(s3, tmp_path):
     """Test audio waveform generation."""
     # Create and upload test audio
-    test_audio = create_test_audio()
+    test_audio = create_test_audio(tmp_path)
     s3.upload_file(test_audio, TEST_BUCKET, "test.wav")
     
     # Test waveform generation
@@ -83,7 +78,7 @@ def test_audio_waveform(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "waveformUrl" in body
     assert "waveformKey" in body
     
@@ -91,14 +86,11 @@ def test_audio_waveform(s3):
     waveform_key = body["waveformKey"]
     response = s3.head_object(Bucket=TEST_BUCKET, Key=waveform_key)
     assert response["ContentType"] == "image/png"
-    
-    # Cleanup
-    os.unlink(test_audio)
 
-def test_invalid_timestamp(s3):
+def test_invalid_timestamp(s3, tmp_path):
     """Test handling of invalid timestamps."""
     # Create and upload test video
-    test_video = create_test_video()
+    test_video = create_test_video(tmp_path)
     s3.upload_file(test_video, TEST_BUCKET, "test.mp4")
     
     # Test invalid timestamp
@@ -111,12 +103,9 @@ def test_invalid_timestamp(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 400
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
     assert "invalid timestamp" in body["error"]["message"].lower()
-    
-    # Cleanup
-    os.unlink(test_video)
 
 def test_missing_file(s3):
     """Test handling of missing files."""
@@ -128,7 +117,7 @@ def test_missing_file(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 404
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
     assert "file not found" in body["error"]["message"].lower()
 
@@ -142,6 +131,6 @@ def test_invalid_media_type(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 400
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
     assert "invalid media type" in body["error"]["message"].lower() 
\ No newline at end of file
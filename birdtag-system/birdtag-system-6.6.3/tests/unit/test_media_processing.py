@@ -3,6 +3,7 @@ import json
 from src.handlers.media_processor_handler import lambda_handler
 from src.handlers.thumbnail_handler import lambda_handler as thumbnail_handler
 from src.utils.error_utils import BirdTagError, ErrorCode
+from _util import jloads
 
 def test_video_processing(s3):
     # Test video processing
@@ -15,7 +16,7 @@ def test_video_processing(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "previewUrl" in body
     assert "previewKey" in body
 
@@ -29,7 +30,7 @@ def test_audio_processing(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "waveformUrl" in body
     assert "waveformKey" in body
 
@@ -45,7 +46,7 @@ def test_thumbnail_generation(s3):
     }
     response = thumbnail_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "thumbnailUrl" in body
     assert "thumbnailKey" in body
 
@@ -59,7 +60,7 @@ def test_invalid_media_type(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 400
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
 
 def test_missing_file(s3):
@@ -72,7 +73,7 @@ def test_missing_file(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 404
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
 
 def test_invalid_timestamp(s3):
@@ -86,5 +87,5 @@ def test_invalid_timestamp(s3):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 400
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body 
\ No newline at end of file
@@ -3,6 +3,7 @@ import json
 from src.handlers.bird_detection_lambda import lambda_handler as detection_handler
 from src.handlers.birdnet_analyzer_lambda import lambda_handler as analyzer_handler
 from src.utils.error_utils import BirdTagError, ErrorCode
+from _util import jloads
 
 def test_bird_detection(s3, dynamodb):
     # Test bird detection
@@ -14,7 +15,7 @@ def test_bird_detection(s3, dynamodb):
     }
     response = detection_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "detections" in body
     assert "species" in body
     assert "confidence" in body
@@ -29,7 +30,7 @@ def test_bird_sound_analysis(s3, dynamodb):
     }
     response = analyzer_handler(event, {})
     assert response["statusCode"] == 200
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "detections" in body
     assert "species" in body
     assert "confidence" in body
@@ -78,7 +79,7 @@ def test_invalid_image(s3, dynamodb):
     }
     response = detection_handler(event, {})
     assert response["statusCode"] == 400
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
 
 def test_invalid_audio(s3, dynamodb):
@@ -91,7 +92,7 @@ def test_invalid_audio(s3, dynamodb):
     }
     response = analyzer_handler(event, {})
     assert response["statusCode"] == 400
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body
 
 def test_model_error(s3, dynamodb):
@@ -104,5 +105,5 @@ def test_model_error(s3, dynamodb):
     }
     response = detection_handler(event, {})
     assert response["statusCode"] == 500
-    body = json.loads(response["body"])
+    body = jloads(response["body"])
     assert "error" in body 
\ No newline at end of file
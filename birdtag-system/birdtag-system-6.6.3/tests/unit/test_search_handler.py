@@ -0,0 +1,58 @@
+import pytest
+import boto3
+from src.handlers import search_handler
+from src.utils.dynamo_utils import tag_index_rows
+
+ITEMS = [
+    {"fileKey": "uploads/a.jpg", "fileUrl": "a", "tags": ["crow,2"], "status": "completed"},
+    {"fileKey": "uploads/b.jpg", "fileUrl": "b", "tags": ["crow,0"], "status": "completed"},
+    {"fileKey": "uploads/c.jpg", "fileUrl": "c", "tags": ["pigeon,1"], "status": "completed"},
+]
+
+@pytest.fixture
+def tables():
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    media = dynamodb.create_table(
+        TableName="BirdTagMedia",
+        KeySchema=[{"AttributeName": "fileKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "fileKey", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    index = dynamodb.create_table(
+        TableName="BirdTagTagIndex",
+        KeySchema=[
+            {"AttributeName": "species", "KeyType": "HASH"},
+            {"AttributeName": "fileKey", "KeyType": "RANGE"}
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "species", "AttributeType": "S"},
+            {"AttributeName": "fileKey", "AttributeType": "S"},
+            {"AttributeName": "count", "AttributeType": "N"}
+        ],
+        LocalSecondaryIndexes=[{
+            "IndexName": search_handler.TAG_COUNT_INDEX,
+            "KeySchema": [
+                {"AttributeName": "species", "KeyType": "HASH"},
+                {"AttributeName": "count", "KeyType": "RANGE"}
+            ],
+            "Projection": {"ProjectionType": "ALL"}
+        }],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    for item in ITEMS:
+        media.put_item(Item=item)
+        for row in tag_index_rows(item):
+            index.put_item(Item=row)
+    return media, index
+
+def test_any_species_index_matches_scan(tables, monkeypatch):
+    _, index = tables
+    projection = "fileKey, fileUrl, tags, speciesSet"
+    
+    monkeypatch.setattr(search_handler, "tag_index", None)
+    scanned = search_handler.files_with_any_species(["crow"], projection)
+    monkeypatch.setattr(search_handler, "tag_index", index)
+    queried = search_handler.files_with_any_species(["crow"], projection)
+    
+    assert {item["fileKey"] for item in queried} == {item["fileKey"] for item in scanned}
+    assert {item["fileKey"] for item in queried} == {"uploads/a.jpg", "uploads/b.jpg"}
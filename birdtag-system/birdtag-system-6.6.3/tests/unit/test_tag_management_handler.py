@@ -1,6 +1,5 @@
 import pytest
 import os
-from moto import mock_dynamodb
 import boto3
 from src.handlers.tag_handler import lambda_handler
 
@@ -9,16 +8,15 @@ os.environ["DYNAMODB_TABLE"] = DYNAMODB_TABLE
 
 @pytest.fixture
 def dynamodb():
-    with mock_dynamodb():
-        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-        table = dynamodb.create_table(
-            TableName=DYNAMODB_TABLE,
-            KeySchema=[{"AttributeName": "fileKey", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "fileKey", "AttributeType": "S"}],
-            BillingMode="PAY_PER_REQUEST"
-        )
-        table.put_item(Item={"fileKey": "test.jpg", "tags": ["crow"]})
-        yield table
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    table = dynamodb.create_table(
+        TableName=DYNAMODB_TABLE,
+        KeySchema=[{"AttributeName": "fileKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "fileKey", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    table.put_item(Item={"fileKey": "test.jpg", "tags": ["crow"]})
+    return table
 
 def test_add_tag(dynamodb):
     event = {
@@ -1,8 +1,10 @@
 import pytest
+import io
+import json
 import os
 import tempfile
-from moto import mock_s3, mock_dynamodb
 import boto3
+from PIL import Image
 from src.handlers.thumbnail_handler import lambda_handler
 
 MEDIA_BUCKET = "media-bucket"
@@ -13,22 +15,20 @@ os.environ["DYNAMODB_TABLE"] = DYNAMODB_TABLE
 
 @pytest.fixture
 def s3():
-    with mock_s3():
-        s3 = boto3.client("s3", region_name="us-east-1")
-        s3.create_bucket(Bucket=MEDIA_BUCKET)
-        yield s3
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket=MEDIA_BUCKET)
+    return s3
 
 @pytest.fixture
 def dynamodb():
-    with mock_dynamodb():
-        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-        table = dynamodb.create_table(
-            TableName=DYNAMODB_TABLE,
-            KeySchema=[{"AttributeName": "fileKey", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "fileKey", "AttributeType": "S"}],
-            BillingMode="PAY_PER_REQUEST"
-        )
-        yield table
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    table = dynamodb.create_table(
+        TableName=DYNAMODB_TABLE,
+        KeySchema=[{"AttributeName": "fileKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "fileKey", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    return table
 
 def test_thumbnail_creation(s3, dynamodb):
     # Upload a test image
@@ -47,3 +47,21 @@ def test_thumbnail_creation(s3, dynamodb):
     }
     response = lambda_handler(event, {})
     assert response["statusCode"] == 200
+
+def test_thumbnail_regenerated_when_source_overwritten(s3):
+    def upload(color):
+        buffer = io.BytesIO()
+        Image.new("RGB", (400, 300), color).save(buffer, "JPEG")
+        s3.put_object(Bucket=MEDIA_BUCKET, Key="uploads/test.jpg", Body=buffer.getvalue())
+    
+    event = {"body": json.dumps({"bucket": MEDIA_BUCKET, "key": "uploads/test.jpg"})}
+    upload("red")
+    assert json.loads(lambda_handler(event, {})["body"])["message"] == "Thumbnail generated successfully"
+    assert json.loads(lambda_handler(event, {})["body"])["message"] == "Thumbnail already exists"
+    
+    # Same key, new content: the existing thumbnail is stale
+    upload("blue")
+    assert json.loads(lambda_handler(event, {})["body"])["message"] == "Thumbnail generated successfully"
+    source_etag = s3.head_object(Bucket=MEDIA_BUCKET, Key="uploads/test.jpg")["ETag"].strip('"')
+    thumbnail = s3.head_object(Bucket=MEDIA_BUCKET, Key="thumbnails/test.jpg")
+    assert thumbnail["Metadata"]["source-etag"] == source_etag
@@ -1,7 +1,7 @@
 import pytest
 from src.utils.error_utils import BirdTagError, ErrorCode
 from src.utils.s3_utils import get_content_type
-from src.utils.dynamo_utils import create_media_record
+from src.utils.dynamo_utils import create_media_record, parse_tag, species_bloom, tag_attributes, tag_index_rows
 from src.utils.image_utils import is_valid_image
 from src.utils.audio_utils import is_valid_audio
 
@@ -21,6 +21,38 @@ def test_get_content_type():
     assert get_content_type("test.wav") == "audio/wav"
     assert get_content_type("test.mp3") == "audio/mpeg"
 
+def test_parse_tag():
+    assert parse_tag("crow,3") == ("crow", 3)
+    assert parse_tag(" pigeon ,1") == ("pigeon", 1)
+    assert parse_tag("crow") is None
+    assert parse_tag("crow,many") is None
+
+def test_tag_attributes():
+    assert tag_attributes(["crow,3", "pigeon,1", "bad"]) == {
+        'tagMap': {"crow": 3, "pigeon": 1},
+        'speciesBloom': species_bloom(["crow", "pigeon"]),
+        'speciesSet': {"crow", "pigeon"}
+    }
+    assert tag_attributes([]) == {'tagMap': {}, 'speciesBloom': 0}
+
+def test_species_bloom():
+    both = species_bloom(["crow", "pigeon"])
+    assert species_bloom([]) == 0
+    assert both & species_bloom(["crow"]) == species_bloom(["crow"])
+    assert both & species_bloom(["pigeon"]) == species_bloom(["pigeon"])
+
+def test_tag_index_rows():
+    item = {'fileKey': 'uploads/a.jpg', 'fileUrl': 'url', 'tags': ["crow,3", "bad"], 'status': 'completed'}
+    assert tag_index_rows(item) == [{
+        'species': 'crow',
+        'fileKey': 'uploads/a.jpg',
+        'count': 3,
+        'fileUrl': 'url',
+        'tags': ["crow,3", "bad"],
+        'status': 'completed'
+    }]
+    assert tag_index_rows({'fileKey': 'uploads/b.jpg', 'tags': []}) == []
+
 def test_is_valid_image():
     assert is_valid_image("test.jpg")
     assert is_valid_image("test.png")
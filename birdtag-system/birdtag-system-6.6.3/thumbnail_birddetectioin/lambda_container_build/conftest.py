@@ -0,0 +1,46 @@
+import os
+import boto3
+import pytest
+from moto import mock_aws
+
+TEST_BUCKET = 'test-bucket'
+TEST_TABLE = 'BirdTagMedia'
+TEST_CACHE_TABLE = 'BirdTagDetectorCache'
+TEST_IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_image.jpg')
+
+@pytest.fixture(scope='session')
+def test_image_bytes():
+    """
+    Sample image content, read from disk once per test session.
+    """
+    with open(TEST_IMAGE_PATH, 'rb') as f:
+        return f.read()
+
+@pytest.fixture
+def aws_resources():
+    """
+    Mocked S3 bucket, DynamoDB media table and detector cache table,
+    created fresh for each test.
+
+    Yields:
+        tuple: (S3 client, DynamoDB Table resource)
+    """
+    with mock_aws():
+        s3 = boto3.client('s3', region_name='us-east-1')
+        # No LocationConstraint needed for us-east-1
+        s3.create_bucket(Bucket=TEST_BUCKET)
+
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName=TEST_TABLE,
+            KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'id', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        dynamodb.create_table(
+            TableName=TEST_CACHE_TABLE,
+            KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'id', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        yield s3, table
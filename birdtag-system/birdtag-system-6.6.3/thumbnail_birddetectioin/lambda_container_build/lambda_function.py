@@ -1,47 +1,165 @@
-import json
 import os
-import tempfile
+import logging
+import threading
+
+# BLAS/OpenMP pools size themselves when torch is imported; match them to the
+# vCPUs the Lambda sandbox exposes unless the function config overrides them
+_VCPUS = str(os.cpu_count() or 1)
+for _var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+    os.environ.setdefault(_var, _VCPUS)
+
+# Configure environment variables for matplotlib, YOLO and any transitive
+# numba/torch caches; only /tmp is writable in Lambda
+os.environ['MPLCONFIGDIR'] = '/tmp/matplotlib'
+os.environ['YOLO_CONFIG_DIR'] = '/tmp/ultralytics'
+os.environ.setdefault('NUMBA_CACHE_DIR', '/tmp/numba')
+os.environ.setdefault('TORCH_HOME', '/tmp/torch')
+
+# Ensure required directories exist for temporary storage
+os.makedirs('/tmp/matplotlib', exist_ok=True)
+os.makedirs('/tmp/ultralytics', exist_ok=True)
+
+torch = None
+YOLO = None
+
+def _import_inference_stack():
+    """
+    Import torch and ultralytics, which dominate module import time.
+    """
+    global torch, YOLO
+    import torch
+    from ultralytics import YOLO
+    from ultralytics.utils import LOGGER as yolo_logger
+    # Ultralytics reports per-image summaries through its own logger; keep
+    # only errors so inference does not add stdout writes to every invocation
+    yolo_logger.setLevel(logging.ERROR)
+
+# Start the heavy imports in the background so reading their files from the
+# image overlaps with the AWS client setup, codec warm-up and handler
+# definitions below; get_model() waits for it, and the model warm-up at the
+# end of this module is the first call
+_inference_import = threading.Thread(target=_import_inference_stack, daemon=True)
+_inference_import.start()
+
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import uuid
-from datetime import datetime
-import logging
+from datetime import datetime, timezone
 import traceback
 import decimal
-from ultralytics import YOLO
 import cv2
 import numpy as np
 from PIL import Image
 import io
-import sys
+import time
+from operator import itemgetter
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from aws_lambda_powertools.utilities.data_classes import S3Event
 
-# Configure environment variables for matplotlib and YOLO
-os.environ['MPLCONFIGDIR'] = '/tmp/matplotlib'
-os.environ['YOLO_CONFIG_DIR'] = '/tmp/ultralytics'
-
-# Ensure required directories exist for temporary storage
-os.makedirs('/tmp/matplotlib', exist_ok=True)
-os.makedirs('/tmp/ultralytics', exist_ok=True)
-
 # Initialize AWS Lambda Powertools logger for structured logging
 logger = Logger()
 
-# Initialize AWS service clients
-s3 = boto3.client('s3')
+# Invocation-independent settings, resolved once per container
+IS_LOCAL_TEST = os.environ.get("LOCAL_TEST") == "1"
+MAX_THUMB = 200
+JPEG_QUALITY = 75
+SPECIES_PREFIX = 'species/'
+THUMBNAIL_PREFIX = 'thumbnail/'
+_UTC = timezone.utc
+THUMBNAIL_CONTENT_TYPE = 'image/jpeg'
+# Inference settings passed straight to the predictor so ultralytics does
+# not probe for devices or fall back to its own defaults on each call
+CONF_THRESH = float(os.environ.get('CONF_THRESH', '0.25'))
+INFERENCE_SIZE = 640
+PREDICT_ARGS = {
+    'stream': True,
+    'verbose': False,
+    'imgsz': INFERENCE_SIZE,
+    'conf': CONF_THRESH,
+    'device': 'cpu',
+    'half': False
+}
+
+# Initialize AWS service clients once per container; keep-alive lets warm
+# invocations reuse the pooled TLS connections instead of reconnecting
+s3 = boto3.client('s3', config=Config(
+    tcp_keepalive=True,
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 3}
+))
 try:
-    ddb_table_name = os.environ['DDB_TABLE']
-    logger.info(f"[INIT] DDB_TABLE environment variable: {ddb_table_name}")
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(ddb_table_name)
+    TABLE_NAME = os.environ['DDB_TABLE']
+    logger.info(f"[INIT] DDB_TABLE environment variable: {TABLE_NAME}")
+    dynamodb = boto3.resource('dynamodb', config=Config(
+        tcp_keepalive=True,
+        max_pool_connections=32
+    ))
+    table = dynamodb.Table(TABLE_NAME)
+    # Detection cache rows and idempotency markers expire via TTL, so they
+    # live in their own table rather than among the media records
+    CACHE_TABLE_NAME = os.environ.get('CACHE_TABLE', 'BirdTagDetectorCache')
+    cache_table = dynamodb.Table(CACHE_TABLE_NAME)
 except Exception as e:
     logger.error(f"[INIT] Error initializing DynamoDB table: {e}")
     table = None
-    sys.stdout.flush()
+    cache_table = None
+
+# Detection results are cached per S3 ETag under this id prefix
+CACHE_ID_PREFIX = 'cache#'
+CACHE_TTL = int(os.environ.get('CACHE_TTL', 7 * 24 * 3600))
+
+# Markers that let redelivered S3 events return the first invocation's result
+IDEMPOTENCY_ID_PREFIX = 'idem#'
+IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', 3600))
+# A claim without a result older than this belongs to an invocation that
+# timed out or ran out of memory; set it to the function timeout
+IDEMPOTENCY_CLAIM_TIMEOUT = int(os.environ.get('IDEMPOTENCY_CLAIM_TIMEOUT', 900))
+
+def _json_default(obj):
+    # Cached detections come back from DynamoDB as Decimal
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj) -> str:
+    """
+    Serialize a response body with orjson.
+    
+    Args:
+        obj: JSON-compatible object, may contain Decimal values
+        
+    Returns:
+        str: JSON document
+    """
+    return orjson.dumps(obj, default=_json_default).decode()
+
+# Response bodies that never change between invocations
+IN_PROGRESS_BODY = dumps({'message': 'Image is already being processed'})
+
+# Shared worker pool for overlapping independent S3/DynamoDB round-trips;
+# kept global so warm invocations reuse the threads
+executor = ThreadPoolExecutor(max_workers=4)
 
 # Global variable for model instance caching
 model = None
+# Class names and their species codes indexed by class id, built once per load
+class_names = []
+class_codes = []
+# Whether the loaded model accepts several images per forward pass; traced
+# TorchScript exports are fixed at the batch size they were exported with
+model_batches = True
+
+# Exported graphs baked into the image at build time, fastest first; the
+# .pt weights are only loaded when none of them is present. The INT8 graph
+# comes from quantize_model.py and is skipped unless MODEL_PRECISION is int8
+MODEL_PRECISION = os.environ.get('MODEL_PRECISION', 'int8').lower()
+MODEL_EXPORT_SUFFIXES = ('.onnx', '.torchscript')
+if MODEL_PRECISION == 'int8':
+    MODEL_EXPORT_SUFFIXES = ('_int8.onnx',) + MODEL_EXPORT_SUFFIXES
 
 def get_model():
     """
@@ -52,13 +170,14 @@ def get_model():
     Returns:
         YOLO: Initialized YOLO model instance
     """
-    global model
+    global model, class_names, class_codes, model_batches
     if model is None:
+        _inference_import.join()
+        if YOLO is None:
+            # The background import failed; retry here so the error surfaces
+            _import_inference_stack()
         try:
-            # Check if running in local test mode
-            is_local_test = os.environ.get("LOCAL_TEST") == "1"
-            
-            if is_local_test:
+            if IS_LOCAL_TEST:
                 # Local test mode: Use model file from current directory
                 model_path = os.path.join(os.getcwd(), "model.pt")
                 logger.info(f"Local test: Loading model from current directory: {model_path}")
@@ -67,9 +186,20 @@ def get_model():
                 root = os.environ.get('LAMBDA_TASK_ROOT', '/var/task')
                 model_path = os.environ.get('MODEL_PATH', 'model/model.pt')
                 model_path = os.path.join(root, model_path)
+                # Prefer an optimized export baked into the image at build time
+                base_path = os.path.splitext(model_path)[0]
+                for suffix in MODEL_EXPORT_SUFFIXES:
+                    if os.path.exists(base_path + suffix):
+                        model_path = base_path + suffix
+                        break
                 logger.info(f"Lambda environment: Loading model from: {model_path}")
             
-            model = YOLO(model_path)
+            # Match intra-op threads to the vCPUs Lambda actually grants
+            torch.set_num_threads(int(os.environ['OMP_NUM_THREADS']))
+            model = YOLO(model_path, task='detect')
+            model_batches = not model_path.endswith('.torchscript')
+            class_names = [model.names[i] for i in sorted(model.names)]
+            class_codes = [name.lower().replace(' ', '_') for name in class_names]
             logger.info("Model loaded successfully")
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
@@ -77,10 +207,30 @@ def get_model():
             raise
     return model
 
+# Pillow imports and registers its format plugins on the first Image.open,
+# and libjpeg sets up on the first OpenCV JPEG call; trigger both during
+# init so the first invocation does not pay for them
+Image.preinit()
+cv2.imdecode(cv2.imencode('.jpg', np.zeros((8, 8, 3), np.uint8))[1], cv2.IMREAD_COLOR)
+
+# Detection coordinates and confidences are stored to 8 decimal places;
+# quantizing the exact binary value avoids a float -> str -> Decimal round-trip
+DECIMAL_QUANTUM = decimal.Decimal('1E-8')
+DECIMAL_CONTEXT = decimal.Context(prec=18, rounding=decimal.ROUND_HALF_EVEN)
+
+def _quantize_float(value: float) -> decimal.Decimal:
+    try:
+        return decimal.Decimal(value).quantize(DECIMAL_QUANTUM, context=DECIMAL_CONTEXT)
+    except decimal.InvalidOperation:
+        # Magnitude too large for the fixed precision
+        return decimal.Decimal(str(value))
+
 def float_to_decimal(obj):
     """
     Convert float values to Decimal type for DynamoDB compatibility.
-    Recursively processes nested structures (lists and dictionaries).
+    Walks nested lists and dictionaries with an explicit stack, copying
+    each container once and converting its floats in place in the copy;
+    the input is left untouched as it is shared with the response payload.
     
     Args:
         obj: Input object (float, list, or dict)
@@ -89,18 +239,134 @@ def float_to_decimal(obj):
         Decimal or original object type
     """
     if isinstance(obj, float):
-        return decimal.Decimal(str(obj))
-    elif isinstance(obj, list):
-        return [float_to_decimal(i) for i in obj]
-    elif isinstance(obj, dict):
-        return {k: float_to_decimal(v) for k, v in obj.items()}
-    else:
+        return _quantize_float(obj)
+    if not isinstance(obj, (list, dict)):
         return obj
+    
+    result = obj.copy()
+    stack = [result]
+    while stack:
+        container = stack.pop()
+        entries = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, value in entries:
+            if isinstance(value, float):
+                container[key] = _quantize_float(value)
+            elif isinstance(value, (list, dict)):
+                child = value.copy()
+                container[key] = child
+                stack.append(child)
+    return result
+
+# libjpeg DCT-domain downscale factors, largest first
+REDUCED_READ_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+def create_thumbnail(
+    image: np.ndarray,
+    max_size: int = MAX_THUMB,
+    quality: int = JPEG_QUALITY
+) -> tuple:
+    """
+    Encode a JPEG thumbnail that fits within max_size x max_size.
+    Area-resamples the image already decoded for inference, so the source
+    is only decoded once per invocation.
+    
+    Args:
+        image (np.ndarray): BGR image returned by decode_for_inference
+        max_size (int): Maximum thumbnail width/height in pixels
+        quality (int): JPEG quality of the thumbnail
+        
+    Returns:
+        tuple: (thumbnail JPEG bytes, thumbnail size)
+    """
+    # Size from the decoded array, which OpenCV has already rotated to its
+    # EXIF orientation, rather than from the raw header
+    height, width = image.shape[:2]
+    ratio = min(max_size/width, max_size/height)
+    new_size = (int(width * ratio), int(height * ratio))
+    
+    thumbnail = cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+    # Baseline, non-optimized JPEG; an extra Huffman pass saves little at this size
+    ok, encoded = cv2.imencode('.jpg', thumbnail, [
+        cv2.IMWRITE_JPEG_QUALITY, quality,
+        cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+        cv2.IMWRITE_JPEG_PROGRESSIVE, 0
+    ])
+    if not ok:
+        raise ValueError("Could not encode thumbnail")
+    return encoded.tobytes(), new_size
+
+def decode_for_inference(image_bytes: bytes, original_size: tuple) -> np.ndarray:
+    """
+    Decode an image no larger than the model's input size.
+    Large JPEGs are shrunk during decode where libjpeg can do so without
+    going below INFERENCE_SIZE, and the remainder is resized with the same
+    interpolation ultralytics' letterbox uses, so the predictor only pads.
+    
+    Args:
+        image_bytes (bytes): Encoded source image
+        original_size (tuple): (width, height) read from the image header
+        
+    Returns:
+        np.ndarray: BGR image with its long side at most INFERENCE_SIZE, or
+            None if it cannot be decoded
+    """
+    long_side = max(original_size)
+    
+    read_flag = cv2.IMREAD_COLOR
+    for factor, flag in REDUCED_READ_FLAGS:
+        if long_side // factor >= INFERENCE_SIZE:
+            read_flag = flag
+            break
+    
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), read_flag)
+    if image is None:
+        return None
+    height, width = image.shape[:2]
+    scale = INFERENCE_SIZE / max(height, width)
+    if scale < 1:
+        image = cv2.resize(
+            image,
+            (max(1, round(width * scale)), max(1, round(height * scale))),
+            interpolation=cv2.INTER_LINEAR
+        )
+    return image
+
+def get_species_key(source_key: str, species_name: str) -> str:
+    """
+    Build the species-specific S3 key an image is moved to.
+    
+    Args:
+        source_key (str): Original S3 object key
+        species_name (str): Detected species name for folder organization
+        
+    Returns:
+        str: S3 object key in species-specific directory
+    """
+    return f"{SPECIES_PREFIX}{species_name}/{os.path.basename(source_key)}"
+
+def get_media_id(bucket: str, s3_key: str) -> str:
+    """
+    Derive the media record ID from the object's final S3 location, so a
+    retried event rewrites the same record instead of adding a duplicate.
+    
+    Args:
+        bucket (str): S3 bucket name
+        s3_key (str): S3 key the file is stored under after processing
+        
+    Returns:
+        str: UUID (version 5) string
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"s3://{bucket}/{s3_key}"))
 
 def move_file_to_species_folder(bucket: str, source_key: str, species_name: str) -> str:
     """
     Relocate processed image to species-specific directory in S3.
-    Implements atomic move operation using copy and delete.
+    Copies the object server-side, keeping its metadata and tags, and only
+    deletes the original once the copy has succeeded.
     
     Args:
         bucket (str): S3 bucket name
@@ -110,8 +376,7 @@ def move_file_to_species_folder(bucket: str, source_key: str, species_name: str)
     Returns:
         str: New S3 object key in species-specific directory
     """
-    filename = os.path.basename(source_key)
-    new_key = f"species/{species_name}/{filename}"
+    new_key = get_species_key(source_key, species_name)
     # Execute S3 operations
     s3.copy_object(
         Bucket=bucket,
@@ -119,32 +384,27 @@ def move_file_to_species_folder(bucket: str, source_key: str, species_name: str)
         Key=new_key
     )
     logger.info(f"[S3] Copied file to: {new_key}")
-    sys.stdout.flush()
     s3.delete_object(
         Bucket=bucket,
         Key=source_key
     )
     logger.info(f"[S3] Deleted original file: {source_key}")
-    sys.stdout.flush()
     return new_key
 
-def save_to_dynamodb(
+def build_media_item(
     bucket: str,
-    original_key: str,
     new_key: str,
     thumbnail_key: str,
     detection_boxes: list,
     detected_species: list,
     created_at: str,
     user_id: str = None
-) -> str:
+) -> dict:
     """
-    Persist analysis results to DynamoDB with metadata.
-    Implements error handling and logging for database operations.
+    Build the DynamoDB media record for an analysed image.
     
     Args:
         bucket (str): S3 bucket name
-        original_key (str): Original S3 object key
         new_key (str): New S3 object key in species folder
         thumbnail_key (str): S3 key for thumbnail image
         detection_boxes (list): List of detected bird bounding boxes
@@ -153,11 +413,10 @@ def save_to_dynamodb(
         user_id (str, optional): User identifier
         
     Returns:
-        str: Generated media ID or None if operation fails
+        dict: DynamoDB item keyed by get_media_id
     """
-    media_id = str(uuid.uuid4())
-    item = {
-        'id': media_id,
+    return float_to_decimal({
+        'id': get_media_id(bucket, new_key),
         'user_id': user_id,
         'file_type': 'image',
         's3_path': new_key,
@@ -165,24 +424,273 @@ def save_to_dynamodb(
         'detected_species': detected_species,
         'detection_boxes': detection_boxes,
         'created_at': created_at
-    }
-    item = float_to_decimal(item)
+    })
+
+def save_items_batch(items: list, target_table) -> bool:
+    """
+    Write several items with BatchWriteItem, 25 per request.
+    Unprocessed items are retried by the batch writer.
+    
+    Args:
+        items (list): DynamoDB items to write
+        target_table: DynamoDB Table resource to write to
+        
+    Returns:
+        bool: True if every item was written
+    """
+    try:
+        with target_table.batch_writer(overwrite_by_pkeys=['id']) as batch:
+            for item in items:
+                batch.put_item(Item=item)
+        logger.info(f"[DB] Batch wrote {len(items)} items to DynamoDB")
+    except Exception as e:
+        logger.error(f"[DB] DynamoDB batch write failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+    return True
+
+def save_to_dynamodb(
+    bucket: str,
+    original_key: str,
+    new_key: str,
+    thumbnail_key: str,
+    detection_boxes: list,
+    detected_species: list,
+    created_at: str,
+    user_id: str = None
+) -> str:
+    """
+    Persist analysis results to DynamoDB with metadata.
+    Implements error handling and logging for database operations.
+    
+    Args:
+        bucket (str): S3 bucket name
+        original_key (str): Original S3 object key
+        new_key (str): New S3 object key in species folder
+        thumbnail_key (str): S3 key for thumbnail image
+        detection_boxes (list): List of detected bird bounding boxes
+        detected_species (list): List of detected bird species
+        created_at (str): ISO format timestamp
+        user_id (str, optional): User identifier
+        
+    Returns:
+        str: Media ID or None if operation fails
+    """
+    item = build_media_item(
+        bucket, new_key, thumbnail_key, detection_boxes, detected_species, created_at, user_id
+    )
+    media_id = item['id']
     try:
         table.put_item(Item=item)
         logger.info(f"[DB] Saved analysis results to DynamoDB with ID: {media_id}")
-        sys.stdout.flush()
     except Exception as e:
         logger.error(f"[DB] DynamoDB put_item failed: {e}")
         logger.error(traceback.format_exc())
-        sys.stdout.flush()
         return None
     return media_id
 
+def detect_birds(images: list) -> list:
+    """
+    Run the YOLO model over one or more decoded images in a single forward
+    pass, or one image per pass for exports with a fixed batch size, and
+    collect detections per image.
+    
+    Args:
+        images (list): BGR images returned by decode_for_inference
+        
+    Returns:
+        list: (detection boxes, detected species) tuple for each image
+    """
+    model = get_model()
+    # Results are yielded lazily, one per input image, instead of being
+    # materialized as a full list up front
+    if model_batches:
+        results = model.predict(source=images, **PREDICT_ARGS)
+    else:
+        results = (
+            result
+            for image in images
+            for result in model.predict(source=image, **PREDICT_ARGS)
+        )
+    
+    # Process detection results, one Results object per input image
+    detections = []
+    for result in results:
+        detection_boxes = []
+        detected_species_set = set()
+        
+        boxes = result.boxes
+        if len(boxes) > 0:
+            # Pull coordinates, confidences and classes out as contiguous
+            # arrays; xyxyn is already normalized to the input image size
+            normalized_boxes = boxes.xyxyn.cpu().numpy().astype(np.float64).tolist()
+            confidences = boxes.conf.cpu().numpy().astype(np.float64).tolist()
+            class_ids = boxes.cls.cpu().numpy().astype(np.int32).tolist()
+            
+            for box, confidence, class_id in zip(normalized_boxes, confidences, class_ids):
+                class_name = class_names[class_id]
+                detection_boxes.append({
+                    'species': class_name,
+                    'code': class_codes[class_id],
+                    'box': box,
+                    'confidence': confidence
+                })
+                detected_species_set.add(class_name)
+        
+        detected_species = list(detected_species_set)
+        logger.info("Model inference completed", extra={
+            "detected_species_count": len(detected_species),
+            "detected_species": detected_species,
+            "detection_boxes_count": len(detection_boxes)
+        })
+        detections.append((detection_boxes, detected_species))
+    return detections
+
+def get_cached_detections(etag: str) -> dict:
+    """
+    Look up detections previously stored for an object's content.
+    
+    Args:
+        etag (str): S3 ETag of the image content
+        
+    Returns:
+        dict: Cached detection_boxes, detected_species and thumbnail_path, or None
+    """
+    try:
+        response = cache_table.get_item(
+            Key={'id': f"{CACHE_ID_PREFIX}{etag}"},
+            ProjectionExpression='detection_boxes, detected_species, thumbnail_path'
+        )
+        return response.get('Item')
+    except Exception as e:
+        logger.warning(f"[DB] Detection cache lookup failed: {e}")
+        return None
+
+def build_cache_item(etag: str, thumbnail_key: str, detection_boxes: list, detected_species: list) -> dict:
+    """
+    Build the detection cache record for an object's content.
+    
+    Args:
+        etag (str): S3 ETag of the image content
+        thumbnail_key (str): S3 key of the generated thumbnail
+        detection_boxes (list): List of detected bird bounding boxes
+        detected_species (list): List of detected bird species
+        
+    Returns:
+        dict: DynamoDB item expiring after CACHE_TTL seconds
+    """
+    return float_to_decimal({
+        'id': f"{CACHE_ID_PREFIX}{etag}",
+        'thumbnail_path': thumbnail_key,
+        'detection_boxes': detection_boxes,
+        'detected_species': detected_species,
+        'ttl': int(time.time()) + CACHE_TTL
+    })
+
+def cache_detections(etag: str, thumbnail_key: str, detection_boxes: list, detected_species: list) -> None:
+    """
+    Store detections keyed by content ETag with a TTL for later reuse.
+    
+    Args:
+        etag (str): S3 ETag of the image content
+        thumbnail_key (str): S3 key of the generated thumbnail
+        detection_boxes (list): List of detected bird bounding boxes
+        detected_species (list): List of detected bird species
+    """
+    item = build_cache_item(etag, thumbnail_key, detection_boxes, detected_species)
+    try:
+        cache_table.put_item(Item=item)
+    except Exception as e:
+        logger.warning(f"[DB] Detection cache write failed: {e}")
+
+def claim_invocation(idem_id: str) -> bool:
+    """
+    Record that an object version is being processed. A claim that never
+    stored a result and is older than IDEMPOTENCY_CLAIM_TIMEOUT is taken over,
+    since the invocation holding it was killed before it could release it.
+    
+    Args:
+        idem_id (str): Idempotency marker ID for the bucket, key and ETag
+        
+    Returns:
+        bool: True if this invocation claimed the object, False if an earlier
+            invocation already did and is still running or has finished
+    """
+    now = int(time.time())
+    try:
+        cache_table.put_item(
+            Item={'id': idem_id, 'claimed_at': now, 'ttl': now + IDEMPOTENCY_TTL},
+            ConditionExpression='attribute_not_exists(id) OR (attribute_not_exists(#r) AND claimed_at < :stale)',
+            ExpressionAttributeNames={'#r': 'result'},
+            ExpressionAttributeValues={':stale': now - IDEMPOTENCY_CLAIM_TIMEOUT}
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+def get_claimed_result(idem_id: str) -> str:
+    """
+    Fetch the response body stored by the invocation that claimed an object.
+    
+    Args:
+        idem_id (str): Idempotency marker ID
+        
+    Returns:
+        str: JSON response body, or None if that invocation has not finished
+    """
+    response = cache_table.get_item(Key={'id': idem_id}, ProjectionExpression='#r',
+                                    ExpressionAttributeNames={'#r': 'result'})
+    return response.get('Item', {}).get('result')
+
+def get_idempotency_id(bucket: str, key: str, etag: str) -> str:
+    """
+    Idempotency marker ID for one object version.
+    
+    Args:
+        bucket (str): S3 bucket name
+        key (str): S3 object key
+        etag (str): Object ETag from the S3 event record, may be None
+        
+    Returns:
+        str: Marker ID, or None when the event carries no ETag
+    """
+    return f"{IDEMPOTENCY_ID_PREFIX}{bucket}#{key}#{etag}" if etag else None
+
+def store_claimed_result(idem_id: str, body: str) -> None:
+    """
+    Store the finished response body on this invocation's claim.
+    
+    Args:
+        idem_id (str): Idempotency marker ID
+        body (str): JSON response body
+    """
+    cache_table.update_item(
+        Key={'id': idem_id},
+        UpdateExpression='SET #r = :r',
+        ExpressionAttributeNames={'#r': 'result'},
+        ExpressionAttributeValues={':r': body}
+    )
+
+def release_claim(idem_id: str) -> None:
+    """
+    Delete this invocation's claim so a retry can process the object.
+    
+    Args:
+        idem_id (str): Idempotency marker ID
+    """
+    try:
+        cache_table.delete_item(Key={'id': idem_id})
+    except Exception as e:
+        logger.warning(f"[DB] Failed to release idempotency marker: {e}")
+
 @logger.inject_lambda_context
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """
     AWS Lambda handler for bird detection pipeline.
     Processes S3 events, coordinates image analysis, and manages data persistence.
+    Events carrying several records are processed as one batch.
     
     Args:
         event (dict): S3 event trigger containing file metadata
@@ -195,23 +703,29 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         # Parse S3 event payload with fallback for different event formats
         try:
             s3_event = S3Event(event)
-            records = list(s3_event.records)
-            record = records[0]
-            bucket = record.s3.bucket.name
-            key = record.s3.get_object.key
+            records = [
+                (record.s3.bucket.name, record.s3.get_object.key, record.s3.get_object.etag)
+                for record in s3_event.records
+            ]
         except Exception:
             # Handle legacy event format
-            record = event['Records'][0]
-            bucket = record['s3']['bucket']['name']
-            key = record['s3']['object']['key']
+            records = [
+                (
+                    record['s3']['bucket']['name'],
+                    record['s3']['object']['key'],
+                    record['s3']['object'].get('eTag')
+                )
+                for record in event['Records']
+            ]
         
-        logger.info("Processing image", extra={
-            "bucket": bucket,
-            "key": key,
-            "is_local_test": os.environ.get("LOCAL_TEST") == "1"
+        logger.info("Processing images", extra={
+            "records": records,
+            "is_local_test": IS_LOCAL_TEST
         })
         
-        return process_image(bucket, key)
+        if len(records) == 1:
+            return process_image(*records[0])
+        return process_images(records)
         
     except Exception as e:
         logger.exception("Error in lambda_handler", extra={
@@ -220,126 +734,212 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         })
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': dumps({
                 'message': 'Internal server error',
                 'error': str(e)
             })
         }
 
-def process_image(bucket: str, key: str) -> dict:
+def upload_thumbnail(bucket: str, thumbnail_key: str, image: np.ndarray, original_size: tuple) -> None:
     """
-    Process image through bird detection pipeline.
-    Implements image download, thumbnail generation, model inference,
-    and result persistence.
+    Create a thumbnail and upload it to S3. Runs on the executor so the
+    resize/encode overlaps model inference.
+    
+    Args:
+        bucket (str): S3 bucket name
+        thumbnail_key (str): Destination key for the thumbnail
+        image (np.ndarray): BGR image returned by decode_for_inference
+        original_size (tuple): (width, height) of the source image
+    """
+    thumbnail_bytes, new_size = create_thumbnail(image)
+    # Thumbnails are a few KB: a single PutObject, no transfer manager
+    s3.put_object(
+        Bucket=bucket,
+        Key=thumbnail_key,
+        Body=thumbnail_bytes,
+        ContentType=THUMBNAIL_CONTENT_TYPE
+    )
+    logger.info("Thumbnail uploaded", extra={
+        "bucket": bucket,
+        "thumbnail_key": thumbnail_key,
+        "original_size": original_size,
+        "thumbnail_size": new_size
+    })
+
+def prepare_image(bucket: str, key: str) -> dict:
+    """
+    Fetch an image and start its thumbnail upload, or reuse cached detections.
     
     Args:
         bucket (str): S3 bucket name
         key (str): S3 object key
         
     Returns:
-        dict: Processing results including detections and metadata
+        dict: Job state passed on to inference and finalize_image
     """
-    try:
-        # Download image to temporary storage
-        local_file = f"/tmp/{os.path.basename(key)}"
-        is_local_test = os.environ.get("LOCAL_TEST") == "1" or bucket == "test-bucket"
-        
-        logger.info("Starting image processing", extra={
-            "local_file": local_file,
-            "is_local_test": is_local_test
-        })
-        
-        if is_local_test:
-            import shutil
-            shutil.copyfile(os.path.basename(key), local_file)
-            logger.info("Local test file copied", extra={"source": os.path.basename(key), "destination": local_file})
-        else:
-            s3.download_file(bucket, key, local_file)
-            logger.info("File downloaded from S3", extra={"bucket": bucket, "key": key, "local_path": local_file})
-        
-        # Generate and upload thumbnail
-        thumbnail_key = f"thumbnail/{os.path.basename(key)}"
-        with Image.open(local_file) as img:
-            # Calculate thumbnail dimensions
-            max_size = 200
-            ratio = min(max_size/img.width, max_size/img.height)
-            new_size = (int(img.width * ratio), int(img.height * ratio))
-            # Generate thumbnail
-            thumbnail = img.resize(new_size, Image.Resampling.LANCZOS)
-            # Save thumbnail to memory buffer
-            thumbnail_buffer = io.BytesIO()
-            thumbnail.save(thumbnail_buffer, format='JPEG', quality=75)
-            thumbnail_buffer.seek(0)
-            # Upload thumbnail to S3
-            s3.upload_fileobj(
-                thumbnail_buffer,
-                bucket,
-                thumbnail_key,
-                ExtraArgs={'ContentType': 'image/jpeg'}
+    job = {
+        'bucket': bucket,
+        'key': key,
+        'thumbnail_future': None,
+        'cache_future': None
+    }
+    
+    # Identical content (same ETag) reuses the stored detections instead of
+    # downloading and re-running the model. The thumbnail belongs to the
+    # object that filled the cache, so this object gets its own copy
+    job['etag'] = s3.head_object(Bucket=bucket, Key=key)['ETag'].strip('"')
+    thumbnail_key = f"{THUMBNAIL_PREFIX}{os.path.basename(key)}"
+    job['thumbnail_key'] = thumbnail_key
+    cached = get_cached_detections(job['etag'])
+    if cached and cached['thumbnail_path'] != thumbnail_key:
+        try:
+            s3.copy_object(
+                Bucket=bucket,
+                CopySource={'Bucket': bucket, 'Key': cached['thumbnail_path']},
+                Key=thumbnail_key
             )
-            logger.info("Thumbnail uploaded", extra={
-                "bucket": bucket,
-                "thumbnail_key": thumbnail_key,
-                "original_size": (img.width, img.height),
-                "thumbnail_size": new_size
-            })
-        
-        # Execute model inference
-        logger.info("Starting model inference", extra={"is_local_test": is_local_test})
-        model = get_model()
-        results = model(local_file)
-        
-        # Process detection results
-        detection_boxes = []
-        detected_species_set = set()
-        
-        for result in results:
-            boxes = result.boxes
-            for box in boxes:
-                # Extract coordinates and confidence
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                confidence = float(box.conf[0])
-                class_id = int(box.cls[0])
-                class_name = result.names[class_id]
-                
-                # Normalize coordinates
-                img_height, img_width = result.orig_shape
-                x1, x2 = x1/img_width, x2/img_width
-                y1, y2 = y1/img_height, y2/img_height
-                
-                detection_boxes.append({
-                    'species': class_name,
-                    'code': class_name.lower().replace(' ', '_'),
-                    'box': [x1, y1, x2, y2],
-                    'confidence': confidence
-                })
-                detected_species_set.add(class_name)
-        
-        detected_species = list(detected_species_set)
-        logger.info("Model inference completed", extra={
-            "detected_species_count": len(detected_species),
-            "detected_species": detected_species,
-            "detection_boxes_count": len(detection_boxes)
+        except ClientError as e:
+            # The cached thumbnail was deleted with its object; regenerate
+            logger.info(f"Cached thumbnail unavailable, regenerating: {e}")
+            cached = None
+    job['cached'] = bool(cached)
+    
+    if cached:
+        logger.info("Detection cache hit", extra={"key": key, "etag": job['etag']})
+        job['detection_boxes'] = cached['detection_boxes']
+        job['detected_species'] = cached['detected_species']
+        return job
+    
+    # Read the image once into memory; thumbnail and inference share the bytes
+    image_bytes = s3.get_object(Bucket=bucket, Key=key)['Body'].read()
+    logger.info("File read from S3", extra={"bucket": bucket, "key": key, "size": len(image_bytes)})
+    # Decode once; inference and the thumbnail both use this array
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        original_size, image_format = img.size, img.format
+    image = decode_for_inference(image_bytes, original_size)
+    if image is None:
+        raise ValueError(f"Could not decode image: {key}")
+    # The header size ignores EXIF rotation, which imdecode applies; report
+    # the size as displayed
+    height, width = image.shape[:2]
+    if (width - height) * (original_size[0] - original_size[1]) < 0:
+        original_size = original_size[::-1]
+    job['image'] = image
+    
+    # Small JPEGs are copied as the thumbnail, others encoded off-thread
+    if max(original_size) <= MAX_THUMB and image_format == 'JPEG':
+        # Already thumbnail-sized JPEG: copy it server-side, no re-encode
+        job['thumbnail_future'] = executor.submit(
+            s3.copy_object,
+            Bucket=bucket,
+            CopySource={'Bucket': bucket, 'Key': key},
+            Key=thumbnail_key,
+            ContentType=THUMBNAIL_CONTENT_TYPE,
+            MetadataDirective='REPLACE'
+        )
+        logger.info("Thumbnail copy started", extra={
+            "bucket": bucket,
+            "thumbnail_key": thumbnail_key,
+            "original_size": original_size
         })
+        return job
+    
+    # Generate and upload the thumbnail in the background while the model runs
+    job['thumbnail_future'] = executor.submit(upload_thumbnail, bucket, thumbnail_key, image, original_size)
+    return job
+
+def run_detection(jobs: list) -> None:
+    """
+    Run one batched inference over every job that missed the cache and
+    record the detections on each job. Cache entries for a multi-image
+    batch are written together in one BatchWriteItem.
+    
+    Args:
+        jobs (list): Jobs returned by prepare_image
+    """
+    pending = [job for job in jobs if not job['cached']]
+    if not pending:
+        return
+    
+    logger.info("Starting model inference", extra={"batch_size": len(pending)})
+    detections = detect_birds([job['image'] for job in pending])
+    for job, (detection_boxes, detected_species) in zip(pending, detections):
+        job['detection_boxes'] = detection_boxes
+        job['detected_species'] = detected_species
+    
+    if len(pending) == 1:
+        job = pending[0]
+        job['cache_future'] = executor.submit(
+            cache_detections, job['etag'], job['thumbnail_key'],
+            job['detection_boxes'], job['detected_species']
+        )
+        return
+    
+    cache_items = [
+        build_cache_item(job['etag'], job['thumbnail_key'], job['detection_boxes'], job['detected_species'])
+        for job in pending
+    ]
+    cache_future = executor.submit(save_items_batch, cache_items, cache_table)
+    for job in pending:
+        job['cache_future'] = cache_future
+
+def utc_timestamp() -> str:
+    """
+    Current UTC time as an ISO 8601 string with second precision.
+    
+    Returns:
+        str: Timestamp such as 2024-01-01T12:00:00+00:00
+    """
+    return datetime.now(_UTC).isoformat(timespec='seconds')
+
+def finalize_image(job: dict, pending_items: list = None, created_at: str = None) -> dict:
+    """
+    Move the image to its species folder and persist the media record.
+    Images without detections stay at their upload key.
+    
+    Args:
+        job (dict): Job with detections, as filled in by run_detection
+        pending_items (list, optional): When given, the media record is
+            appended here for the caller to batch write instead of being
+            saved immediately
+        created_at (str, optional): Timestamp shared by a batch of images;
+            defaults to the current time
         
-        # Determine primary species based on highest confidence detection
-        highest_confidence_species = None
-        if detection_boxes:
-            highest_confidence_box = max(detection_boxes, key=lambda x: x['confidence'])
-            highest_confidence_species = highest_confidence_box['species']
-        else:
-            highest_confidence_species = 'unknown'
-        
-        # Organize file in species-specific directory
+    Returns:
+        dict: Processing results for the image
+    """
+    bucket = job['bucket']
+    key = job['key']
+    thumbnail_key = job['thumbnail_key']
+    detection_boxes = job['detection_boxes']
+    detected_species = job['detected_species']
+    
+    # Determine primary species based on highest confidence detection
+    highest_confidence_species = None
+    if detection_boxes:
+        highest_confidence_box = max(detection_boxes, key=itemgetter('confidence'))
+        highest_confidence_species = highest_confidence_box['species']
+    else:
+        highest_confidence_species = 'unknown'
+    
+    # Organize file in species-specific directory while the thumbnail
+    # upload finishes; the media record is only written once the file is
+    # at the key it points to
+    created_at = created_at or utc_timestamp()
+    if detection_boxes:
         new_key = move_file_to_species_folder(bucket, key, highest_confidence_species)
         logger.info("File moved to species folder", extra={
             "original_key": key,
             "new_key": new_key,
             "species": highest_confidence_species
         })
-        
-        # Persist results to DynamoDB
-        created_at = datetime.utcnow().isoformat()
+    else:
+        new_key = key
+    
+    if job['thumbnail_future'] is not None:
+        job['thumbnail_future'].result()
+        logger.info("Thumbnail uploaded", extra={"bucket": bucket, "thumbnail_key": thumbnail_key})
+    if pending_items is None:
         media_id = save_to_dynamodb(
             bucket=bucket,
             original_key=key,
@@ -350,29 +950,80 @@ def process_image(bucket: str, key: str) -> dict:
             created_at=created_at
         )
         logger.info("Analysis results saved to DynamoDB", extra={"media_id": media_id})
+    else:
+        item = build_media_item(
+            bucket, new_key, thumbnail_key, detection_boxes, detected_species, created_at
+        )
+        pending_items.append(item)
+        media_id = item['id']
+    if job['cache_future'] is not None:
+        job['cache_future'].result()
+    
+    return {
+        'message': 'Image processed successfully',
+        'cache_hit': job['cached'],
+        'record_id': media_id,
+        'detected_species': detected_species,
+        'detection_boxes': detection_boxes,
+        'file_location': {
+            'original': key,
+            'new': new_key,
+            'thumbnail': thumbnail_key,
+            'species': highest_confidence_species
+        },
+        'created_at': created_at
+    }
+
+def process_image(bucket: str, key: str, etag: str = None) -> dict:
+    """
+    Process image through bird detection pipeline.
+    Implements image download, thumbnail generation, model inference,
+    and result persistence. When the event carries the object's ETag, a
+    redelivery of the same event returns the stored result instead.
+    
+    Args:
+        bucket (str): S3 bucket name
+        key (str): S3 object key
+        etag (str, optional): Object ETag from the S3 event record
         
-        # Cleanup temporary files
-        os.remove(local_file)
-        logger.info("Temporary file cleaned up", extra={"file": local_file})
+    Returns:
+        dict: Processing results including detections and metadata
+    """
+    idem_id = get_idempotency_id(bucket, key, etag)
+    try:
+        logger.info("Starting image processing", extra={
+            "bucket": bucket,
+            "key": key,
+            "is_local_test": IS_LOCAL_TEST or bucket == "test-bucket"
+        })
+        
+        if idem_id and not claim_invocation(idem_id):
+            # The marker belongs to the earlier invocation; never release it here
+            claimed_id, idem_id = idem_id, None
+            body = get_claimed_result(claimed_id)
+            logger.info("Duplicate invocation", extra={"key": key, "completed": body is not None})
+            if body is None:
+                return {
+                    'statusCode': 202,
+                    'body': IN_PROGRESS_BODY
+                }
+            return {'statusCode': 200, 'body': body}
+        
+        job = prepare_image(bucket, key)
+        run_detection([job])
+        body = dumps(finalize_image(job))
+        
+        if idem_id:
+            store_claimed_result(idem_id, body)
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
-                'message': 'Image processed successfully',
-                'record_id': media_id,
-                'detected_species': detected_species,
-                'detection_boxes': detection_boxes,
-                'file_location': {
-                    'original': key,
-                    'new': new_key,
-                    'thumbnail': thumbnail_key,
-                    'species': highest_confidence_species
-                },
-                'created_at': created_at
-            })
+            'body': body
         }
         
     except Exception as e:
+        if idem_id:
+            release_claim(idem_id)
         logger.exception("Error processing image", extra={
             "error": str(e),
             "traceback": traceback.format_exc(),
@@ -381,8 +1032,124 @@ def process_image(bucket: str, key: str) -> dict:
         })
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': dumps({
                 'message': 'Error processing image',
                 'error': str(e)
             })
-        } 
+        }
+
+def claim_record(record: tuple) -> dict:
+    """
+    Claim one event record, or look up the result of the invocation that
+    already claimed it.
+    
+    Args:
+        record (tuple): (bucket, key, etag) from the S3 event
+        
+    Returns:
+        dict: 'idem_id' of the new claim (None without an ETag) and, for a
+            record claimed earlier, its stored 'result' or in-progress message
+    """
+    bucket, key, etag = record
+    idem_id = get_idempotency_id(bucket, key, etag)
+    if not idem_id or claim_invocation(idem_id):
+        return {'idem_id': idem_id}
+    
+    body = get_claimed_result(idem_id)
+    logger.info("Duplicate invocation", extra={"key": key, "completed": body is not None})
+    return {'idem_id': None, 'result': orjson.loads(body or IN_PROGRESS_BODY)}
+
+def try_prepare_image(record: tuple) -> dict:
+    """
+    Claim a record and fetch its image, capturing any failure on the job
+    instead of raising so other records in the event still complete.
+    
+    Args:
+        record (tuple): (bucket, key, etag) from the S3 event
+        
+    Returns:
+        dict: Job from prepare_image, or a claim with 'result' or 'error' set
+    """
+    bucket, key, _ = record
+    job = {'bucket': bucket, 'key': key, 'idem_id': None}
+    try:
+        job.update(claim_record(record))
+        if 'result' not in job:
+            job.update(prepare_image(bucket, key))
+    except Exception as e:
+        logger.exception("Error preparing image", extra={"bucket": bucket, "key": key})
+        job['error'] = str(e)
+    return job
+
+def process_images(records: list) -> dict:
+    """
+    Process several images from one event, sharing S3 reads across the
+    worker pool and running a single batched YOLO forward pass. Each record
+    is claimed separately, so redelivered records are skipped and one
+    failing image does not fail the others.
+    
+    Args:
+        records (list): (bucket, key, etag) tuples from the S3 event
+        
+    Returns:
+        dict: Processing results for every image, and the images that failed
+    """
+    jobs = list(executor.map(try_prepare_image, records))
+    pending = [job for job in jobs if 'result' not in job and 'error' not in job]
+    try:
+        run_detection(pending)
+    except Exception as e:
+        logger.exception("Error running batched detection", extra={"records": records})
+        for job in pending:
+            job['error'] = str(e)
+    
+    # Media records are collected and written in one batch at the end
+    media_items = []
+    finalized = []
+    created_at = utc_timestamp()
+    for job in pending:
+        if 'error' in job:
+            continue
+        try:
+            job['result'] = finalize_image(job, media_items, created_at)
+            finalized.append(job)
+        except Exception as e:
+            logger.exception("Error finalizing image", extra={"bucket": job['bucket'], "key": job['key']})
+            job['error'] = str(e)
+    if media_items and not save_items_batch(media_items, table):
+        for job in finalized:
+            job['result']['record_id'] = None
+    
+    results, failed = [], []
+    for job in jobs:
+        if 'error' in job:
+            if job['idem_id']:
+                release_claim(job['idem_id'])
+            failed.append({'key': job['key'], 'error': job['error']})
+            continue
+        if job['idem_id']:
+            try:
+                store_claimed_result(job['idem_id'], dumps(job['result']))
+            except Exception as e:
+                logger.warning(f"[DB] Failed to store idempotency result: {e}")
+        results.append(job['result'])
+    
+    return {
+        'statusCode': 500 if failed else 200,
+        'body': dumps({
+            'message': 'Some images failed' if failed else 'Images processed successfully',
+            'results': results,
+            'failed': failed
+        })
+    }
+
+# Load the model during the Lambda init phase so only cold starts pay for
+# it, and run one blank frame through it so kernel selection and lazy
+# imports happen before the first real event. This stays at the end of the
+# module so all of the setup above overlaps the background import; a
+# failure here is retried lazily by the first invocation
+try:
+    for _ in get_model().predict(source=np.zeros((640, 640, 3), np.uint8), **PREDICT_ARGS):
+        pass
+except Exception:
+    logger.warning("Model warm-up failed", exc_info=True)
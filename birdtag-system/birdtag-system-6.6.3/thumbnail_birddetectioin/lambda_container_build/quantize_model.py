@@ -0,0 +1,89 @@
+import argparse
+from pathlib import Path
+
+import cv2
+import numpy as np
+import onnx
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    QuantFormat,
+    QuantType,
+    quantize_static
+)
+from ultralytics import YOLO
+
+IMAGE_SIZE = 640
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+class BirdImageReader(CalibrationDataReader):
+    """
+    Feed representative bird images to the ONNX Runtime calibrator,
+    preprocessed the same way ultralytics prepares inference input.
+    """
+    def __init__(self, image_dir: str, input_name: str, limit: int):
+        paths = sorted(
+            p for p in Path(image_dir).iterdir()
+            if p.suffix.lower() in IMAGE_SUFFIXES
+        )[:limit]
+        if not paths:
+            raise ValueError(f"No calibration images found in {image_dir}")
+        self.input_name = input_name
+        self.paths = iter(paths)
+
+    def get_next(self):
+        for path in self.paths:
+            img = cv2.imread(str(path))
+            if img is None:
+                continue
+            return {self.input_name: letterbox(img)}
+        return None
+
+def letterbox(img: np.ndarray) -> np.ndarray:
+    """
+    Resize keeping aspect ratio, pad to IMAGE_SIZE square and convert to a
+    normalized NCHW RGB float tensor.
+
+    Args:
+        img (np.ndarray): BGR image as read by OpenCV
+
+    Returns:
+        np.ndarray: Array of shape (1, 3, IMAGE_SIZE, IMAGE_SIZE)
+    """
+    height, width = img.shape[:2]
+    ratio = min(IMAGE_SIZE / width, IMAGE_SIZE / height)
+    new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+    resized = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((IMAGE_SIZE, IMAGE_SIZE, 3), 114, dtype=np.uint8)
+    top, left = (IMAGE_SIZE - new_h) // 2, (IMAGE_SIZE - new_w) // 2
+    canvas[top:top + new_h, left:left + new_w] = resized
+    tensor = canvas[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return np.ascontiguousarray(tensor[np.newaxis])
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an INT8 ONNX model for the bird detection Lambda")
+    parser.add_argument('--weights', default='model.pt', help="YOLO .pt weights to export")
+    parser.add_argument('--calib-dir', required=True, help="Directory of representative bird images")
+    parser.add_argument('--limit', type=int, default=500, help="Maximum number of calibration images")
+    parser.add_argument('--output', default='model_int8.onnx', help="Quantized model path")
+    args = parser.parse_args()
+
+    # Always re-export: a leftover static-batch model.onnx would quantize to
+    # a graph that rejects the batched predict calls the Lambdas make
+    fp32_path = YOLO(args.weights).export(format='onnx', imgsz=IMAGE_SIZE, simplify=True, dynamic=True)
+
+    input_name = onnx.load(fp32_path).graph.input[0].name
+
+    # QDQ with per-channel weights keeps accuracy close to FP32 on conv nets
+    quantize_static(
+        fp32_path,
+        args.output,
+        BirdImageReader(args.calib_dir, input_name, args.limit),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8
+    )
+    print(f"Wrote {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,6 @@
 import json
 import os
-import boto3
-import moto
-from moto import mock_aws
 import pytest
-import uuid
-from datetime import datetime
 import logging
 import traceback
 from decimal import Decimal
@@ -24,10 +19,12 @@ class DecimalEncoder(json.JSONEncoder):
 # Set environment variables (before importing lambda_function)
 os.environ['LOCAL_TEST'] = '1'
 os.environ['DDB_TABLE'] = 'BirdTagMedia'
+os.environ['CACHE_TABLE'] = 'BirdTagDetectorCache'
 os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'  # Set default AWS region
 
 # Import lambda_function after environment setup
 from lambda_function import lambda_handler, float_to_decimal
+from conftest import TEST_BUCKET
 
 # Helper function to create S3 event payload
 def create_s3_event(bucket, key):
@@ -40,8 +37,7 @@ def create_s3_event(bucket, key):
         }]
     }
 
-@mock_aws
-def test_lambda_function():
+def test_lambda_function(aws_resources, test_image_bytes):
     """
     Comprehensive test suite for lambda_function.
     Tests the complete pipeline including:
@@ -58,45 +54,16 @@ def test_lambda_function():
         logger.info(f"DDB_TABLE: {os.environ.get('DDB_TABLE')}")
         logger.info(f"AWS_DEFAULT_REGION: {os.environ.get('AWS_DEFAULT_REGION')}")
         
-        # Initialize mock S3 bucket
-        s3 = boto3.client('s3', region_name='us-east-1')
-        bucket_name = 'test-bucket'
-        try:
-            # No LocationConstraint needed for us-east-1
-            s3.create_bucket(Bucket=bucket_name)
-            logger.info(f"Created mock S3 bucket: {bucket_name}")
-        except Exception as e:
-            # Continue if bucket already exists
-            if 'BucketAlreadyOwnedByYou' in str(e):
-                logger.info(f"Bucket {bucket_name} already exists, continuing...")
-            else:
-                raise
-        
-        # Initialize mock DynamoDB table
-        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        table = dynamodb.create_table(
-            TableName='BirdTagMedia',
-            KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
-            AttributeDefinitions=[{'AttributeName': 'id', 'AttributeType': 'S'}],
-            BillingMode='PAY_PER_REQUEST'
-        )
-        logger.info("Created mock DynamoDB table")
-        
-        # Load test image for processing
-        test_image_path = './test_image.jpg'
-        if not os.path.exists(test_image_path):
-            raise FileNotFoundError(f"Test image not found: {test_image_path}")
-            
-        with open(test_image_path, 'rb') as f:
-            test_image_content = f.read()
-        logger.info(f"Loaded test image: {test_image_path} ({len(test_image_content)} bytes)")
+        # Mock S3 bucket and DynamoDB table come from the conftest fixture
+        s3, table = aws_resources
+        bucket_name = TEST_BUCKET
         
         # Upload test image to mock S3
         test_key = 'upload/image/test_image.jpg'
         s3.put_object(
             Bucket=bucket_name,
             Key=test_key,
-            Body=test_image_content,
+            Body=test_image_bytes,
             ContentType='image/jpeg'
         )
         logger.info(f"Uploaded test image to S3: {test_key}")
@@ -118,7 +85,6 @@ def test_lambda_function():
         media_id = response_body['record_id']
         
         # Verify DynamoDB record creation
-        table = dynamodb.Table('BirdTagMedia')
         items = table.scan()['Items']
         assert len(items) == 1, f"Expected 1 item in DynamoDB, got {len(items)}"
         
@@ -176,9 +142,55 @@ def test_lambda_function():
         logger.error(traceback.format_exc())
         raise
 
+def test_cache_hit_gets_own_thumbnail(aws_resources, test_image_bytes):
+    """
+    The same content uploaded under two keys reuses the cached detections,
+    but each object keeps a thumbnail of its own.
+    """
+    s3, table = aws_resources
+    keys = ['upload/image/first.jpg', 'upload/image/second.jpg']
+    bodies = []
+    for key in keys:
+        s3.put_object(Bucket=TEST_BUCKET, Key=key, Body=test_image_bytes, ContentType='image/jpeg')
+        response = lambda_handler(create_s3_event(TEST_BUCKET, key), {})
+        assert response['statusCode'] == 200
+        bodies.append(json.loads(response['body']))
+    
+    assert [body['cache_hit'] for body in bodies] == [False, True]
+    thumbnails = [body['file_location']['thumbnail'] for body in bodies]
+    assert thumbnails == ['thumbnail/first.jpg', 'thumbnail/second.jpg']
+    
+    # Removing the first object's thumbnail must not affect the second
+    s3.delete_object(Bucket=TEST_BUCKET, Key=thumbnails[0])
+    s3.head_object(Bucket=TEST_BUCKET, Key=thumbnails[1])
+    item = table.get_item(Key={'id': bodies[1]['record_id']})['Item']
+    assert item['thumbnail_path'] == thumbnails[1]
+
+def test_batch_claims_each_record(aws_resources, test_image_bytes):
+    """
+    A multi-record event claims every record on its own: a missing object
+    fails alone, and redelivering the event returns the stored results
+    without processing the images again.
+    """
+    s3, table = aws_resources
+    keys = ['upload/image/a.jpg', 'upload/image/b.jpg', 'upload/image/missing.jpg']
+    for key in keys[:2]:
+        s3.put_object(Bucket=TEST_BUCKET, Key=key, Body=test_image_bytes, ContentType='image/jpeg')
+    event = {'Records': [
+        {'s3': {'bucket': {'name': TEST_BUCKET}, 'object': {'key': key, 'eTag': f'etag-{i}'}}}
+        for i, key in enumerate(keys)
+    ]}
+    
+    body = json.loads(lambda_handler(event, {})['body'])
+    assert [r['file_location']['original'] for r in body['results']] == keys[:2]
+    assert [f['key'] for f in body['failed']] == keys[2:]
+    
+    redelivered = json.loads(lambda_handler(event, {})['body'])
+    assert redelivered['results'] == body['results']
+    assert [f['key'] for f in redelivered['failed']] == keys[2:]
+    assert len(table.scan()['Items']) == 2
+
 if __name__ == "__main__":
-    try:
-        test_lambda_function()
-    except Exception as e:
-        logger.error(f"Test execution failed: {str(e)}")
-        exit(1) 
+    # Fixtures are provided by conftest.py, so run through pytest
+    exit(pytest.main([__file__, '-q']))
+
@@ -4,60 +4,73 @@ import numpy as np
 import json
 from pathlib import Path
 
-def test_model_output(image_path):
+def print_detections(model, img, results):
     """
-    Test YOLO model inference and output detailed detection information.
-    Analyzes image processing, model predictions, and coordinate normalization.
+    Output detailed detection information for one image.
     
     Args:
-        image_path (str): Path to the input image for testing
+        model (YOLO): Model that produced the results, used for class names
+        img (np.ndarray): Input image as read by OpenCV
+        results (Results): Ultralytics results for img
     """
-    # Load YOLO model from current directory
-    model = YOLO('./model.pt')
-    
-    # Read and validate input image
-    img = cv2.imread(image_path)
-    if img is None:
-        print(f"Error: Could not read image {image_path}")
-        return
-        
     # Get image dimensions
     height, width = img.shape[:2]
     print(f"\nImage size: {width}x{height}")
     
-    # Execute model inference
-    results = model(img)[0]
-    
     # Log raw detection results
     print("\nRaw YOLO Results:")
     print(f"Number of detections: {len(results.boxes)}")
     
     # Process and display detailed detection information
     print("\nDetailed Detections:")
-    for i, box in enumerate(results.boxes):
-        # Extract class ID and confidence score
-        cls_id = int(box.cls[0])
-        conf = float(box.conf[0])
-        
+    # Move all boxes, confidences and classes off the tensors in one step
+    raw_boxes = results.boxes.xyxy.cpu().numpy().astype(np.float64)
+    norm_boxes = results.boxes.xyxyn.cpu().numpy().astype(np.float64).tolist()
+    confidences = results.boxes.conf.cpu().numpy().astype(np.float64).tolist()
+    class_ids = results.boxes.cls.cpu().numpy().astype(np.int32).tolist()
+    
+    for i, ((x1, y1, x2, y2), norm_box, conf, cls_id) in enumerate(
+        zip(raw_boxes.tolist(), norm_boxes, confidences, class_ids)
+    ):
         # Get class name from model
         class_name = model.names[cls_id]
         
-        # Extract bounding box coordinates
-        x1, y1, x2, y2 = box.xyxy[0].tolist()
-        
-        # Calculate normalized coordinates
-        norm_box = [
-            float(x1 / width),
-            float(y1 / height),
-            float(x2 / width),
-            float(y2 / height)
-        ]
-        
         print(f"\nDetection {i+1}:")
         print(f"  Class: {class_name}")
         print(f"  Confidence: {conf:.4f}")
         print(f"  Raw box: [{x1:.1f}, {y1:.1f}, {x2:.1f}, {y2:.1f}]")
         print(f"  Normalized box: {[f'{x:.4f}' for x in norm_box]}")
+
+def test_model_output(model, image_paths):
+    """
+    Test YOLO model inference and output detailed detection information.
+    Analyzes image processing, model predictions, and coordinate normalization.
+    All readable images go through the model in a single batched call.
+    
+    Args:
+        model (YOLO): Loaded model, shared across all test images
+        image_paths (list): Paths to the input images for testing
+    """
+    # Read and validate input images
+    paths, imgs = [], []
+    for image_path in image_paths:
+        img = cv2.imread(image_path)
+        if img is None:
+            print(f"Error: Could not read image {image_path}")
+            continue
+        paths.append(image_path)
+        imgs.append(img)
+    if not imgs:
+        return
+    
+    # Execute model inference on the whole batch
+    results_list = model(imgs)
+    
+    for image_path, img, results in zip(paths, imgs, results_list):
+        print(f"\n{'='*50}")
+        print(f"Testing image: {image_path}")
+        print(f"{'='*50}")
+        print_detections(model, img, results)
     
     # Display model class mapping
     print("\nModel Classes:")
@@ -73,8 +86,6 @@ if __name__ == "__main__":
         "../test_images/sparrow_1.jpg"
     ]
     
-    for img_path in test_images:
-        print(f"\n{'='*50}")
-        print(f"Testing image: {img_path}")
-        print(f"{'='*50}")
-        test_model_output(img_path) 
+    # Load YOLO model from current directory once for every test image
+    model = YOLO('./model.pt')
+    test_model_output(model, test_images)